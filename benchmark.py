@@ -0,0 +1,942 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import resource
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import statistics
+import string
+import sys
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rich.console import Console
+from rich.table import Table
+
+from haider import AdvancedScanner, AhoCorasick, KeywordMatcher, KeywordSearch, RequestMetrics
+
+
+class TargetHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a scan target with a handful of known paths"""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY every keep-alive response stalls on delayed ACK
+    disable_nagle_algorithm = True
+
+    pages = {
+        '/admin/': (200, b"<html><title>Admin Login</title><form>password</form></html>"),
+        '/dashboard': (200, b"<html><h1>Dashboard</h1></html>"),
+        '/backup.zip': (200, b"PK\x03\x04" + b"\x00" * 512),
+        '/config.php': (200, b"<?php // config ?>"),
+        '/private/': (403, b"Forbidden"),
+        '/old': (301, b""),
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def delay(self):
+        return self.server.latency
+
+    def page(self, path):
+        """(status, body) served for path"""
+        return self.pages.get(path, (404, b"<html>Not Found</html>"))
+
+    def location(self, path):
+        return path + '/'
+
+    def _respond(self, send_body):
+        self.server.requests[self.command] += 1
+        delay = self.delay()
+        if delay:
+            time.sleep(delay)
+        status, body = self.page(self.path)
+        self.send_response(status)
+        if status in (301, 302):
+            self.send_header('Location', self.location(self.path))
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+
+class LargePageHandler(TargetHandler):
+    """Stand-in whose not-found and forbidden pages carry large bodies"""
+    pages = dict(TargetHandler.pages, **{
+        '/private/': (403, b"<html>Forbidden</html>" + b" " * 200_000),
+    })
+    not_found = b"<html>Not Found</html>" + b" " * 100_000
+
+    def _respond(self, send_body):
+        self.server.requests[self.command] += 1
+        status, body = self.pages.get(self.path, (404, self.not_found))
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+
+
+class ThrottlingHandler(TargetHandler):
+    """Stand-in that answers 429 once clients exceed server.allowed_rate requests/sec"""
+
+    def _respond(self, send_body):
+        server = self.server
+        with server.bucket_lock:
+            now = time.monotonic()
+            server.bucket = min(server.allowed_rate, server.bucket + (now - server.bucket_time) * server.allowed_rate)
+            server.bucket_time = now
+            allowed = server.bucket >= 1
+            if allowed:
+                server.bucket -= 1
+        if allowed:
+            return super()._respond(send_body)
+
+        server.requests['429'] += 1
+        self.send_response(429)
+        self.send_header('Retry-After', '1')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class SimulatorHandler(ThrottlingHandler):
+    """Stand-in whose latency distribution, catch-all pages, body sizes, 429 throttling and
+    redirect chains are configured on the server by start_simulator"""
+    hop = re.compile(r'/hop_(\d+)(?:/(\d+))?$')
+
+    def delay(self):
+        server = self.server
+        with server.rng_lock:
+            if server.latency_dist == 'uniform':
+                return server.rng.uniform(0, 2 * server.latency)
+            if server.latency_dist == 'exponential':
+                return server.rng.expovariate(1 / server.latency) if server.latency else 0
+            if server.latency_dist == 'lognormal':
+                if not server.latency:
+                    return 0
+                return server.rng.lognormvariate(math.log(server.latency) - server.sigma ** 2 / 2, server.sigma)
+        return server.latency
+
+    def page(self, path):
+        if path in self.pages:
+            return self.pages[path]
+        match = self.hop.match(path)
+        if match:
+            return (302, b"") if int(match.group(2) or 0) < self.server.redirect_chain else (200, b"<html>Landed</html>")
+        if self.server.wildcard:
+            return 200, b"<html><h1>Welcome</h1><p>" + path.encode() + b"</p></html>" + self.server.padding
+        return 404, b"<html>Not Found</html>" + self.server.padding
+
+    def location(self, path):
+        match = self.hop.match(path)
+        if match:
+            return f"/hop_{match.group(1)}/{int(match.group(2) or 0) + 1}"
+        return super().location(path)
+
+    def _respond(self, send_body):
+        if self.server.allowed_rate:
+            return super()._respond(send_body)
+        return TargetHandler._respond(self, send_body)
+
+
+class WordPressHandler(TargetHandler):
+    """Stand-in running WordPress on PHP, its admin panel deep in a mixed-platform wordlist"""
+    pages = {
+        '/': (200, b'<html><link rel="stylesheet" href="/wp-content/themes/site/style.css"></html>'),
+        '/wp-admin/': (200, b"<html><title>Dashboard</title><form>login password</form></html>"),
+        '/wp-login.php': (200, b"<html><form>login password</form></html>"),
+    }
+
+    def _respond(self, send_body):
+        server = self.server
+        with server.order_lock:
+            server.requests[self.command] += 1
+            server.first_request.setdefault(self.path, sum(server.requests.values()))
+        status, body = self.pages.get(self.path, (404, b"<html>Not Found</html>"))
+        self.send_response(status)
+        self.send_header('X-Powered-By', 'PHP/8.2')
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class PortalHandler(TargetHandler):
+    """Stand-in whose login portal sits at a nested path no keyword or tier would guess"""
+    pages = {
+        '/': (200, b"<html>Welcome</html>"),
+        '/team/gate': (200, b"<html><form>login password</form></html>"),
+    }
+
+
+class StampingHandler(TargetHandler):
+    """Stand-in that remembers when its first request arrived"""
+
+    def _respond(self, send_body):
+        if self.server.first_seen is None:
+            self.server.first_seen = time.perf_counter()
+        super()._respond(send_body)
+
+
+class TargetServer(ThreadingHTTPServer):
+    """Threaded stand-in server with a listen backlog sized for high concurrency"""
+    daemon_threads = True
+    request_queue_size = 4096
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+def make_certificate(directory):
+    """Create a throwaway self-signed certificate with the openssl CLI"""
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-keyout', key, '-out', cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+def start_target(handler=TargetHandler, latency=0.0, tls=None):
+    """Start the stand-in server on a free localhost port, optionally behind TLS"""
+    server = TargetServer(('127.0.0.1', 0), handler)
+    server.requests = Counter()
+    server.latency = latency
+    server.bytes_sent = 0
+    scheme = 'http'
+    if tls:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*tls)
+        server.socket = context.wrap_socket(server.socket, server_side=True, do_handshake_on_connect=False)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+
+
+def start_simulator(args):
+    """Start a SimulatorHandler stand-in configured from the suite arguments"""
+    server, base_url = start_target(SimulatorHandler, latency=args.latency / 1000)
+    server.latency_dist = args.latency_dist
+    server.sigma = args.sigma
+    server.rng = random.Random(args.seed)
+    server.rng_lock = threading.Lock()
+    server.wildcard = args.wildcard
+    server.padding = b" " * (args.body_kb * 1024)
+    server.redirect_chain = args.redirect_chain
+    server.allowed_rate = args.throttle_rps
+    server.bucket_lock = threading.Lock()
+    server.bucket = args.throttle_rps
+    server.bucket_time = time.monotonic()
+    return server, base_url
+
+
+def write_wordlist(size):
+    """Write a synthetic wordlist containing the known paths plus filler"""
+    fd, path = tempfile.mkstemp(suffix='.txt', prefix='bench_wordlist_')
+    with os.fdopen(fd, 'w') as f:
+        for known in TargetHandler.pages:
+            f.write(known + "\n")
+        for i in range(size - len(TargetHandler.pages)):
+            f.write(f"/missing_{i}\n")
+    return path
+
+
+def write_mixed_wordlist(size):
+    """Write a wordlist mixing ASP.NET, Java and PHP paths with the WordPress admin near the end"""
+    fd, path = tempfile.mkstemp(suffix='.txt', prefix='bench_wordlist_')
+    extensions = ['.aspx', '.jsp', '.php', '', '.asp', '.do']
+    with os.fdopen(fd, 'w') as f:
+        for i in range(size):
+            if i == size * 9 // 10:
+                f.write("/wp-admin/\n/wp-login.php\n")
+            f.write(f"/page_{i}{extensions[i % len(extensions)]}\n")
+    return path
+
+
+def write_suite_wordlist(size, seed):
+    """Write the known paths, a redirect chain entry every 20 lines and shuffled filler"""
+    rng = random.Random(seed)
+    fd, path = tempfile.mkstemp(suffix='.txt', prefix='bench_wordlist_')
+    filler = [f"/hop_{i}" if i % 20 == 0 else f"/missing_{i}" for i in range(size - len(TargetHandler.pages))]
+    rng.shuffle(filler)
+    with os.fdopen(fd, 'w') as f:
+        for line in list(TargetHandler.pages) + filler:
+            f.write(line + "\n")
+    return path
+
+
+class MeasuredScanner(AdvancedScanner):
+    """Scanner that keeps the response time of every request for percentiles"""
+
+    def build_result(self, path, url, status, headers, content_length, response_time):
+        self.latencies.append(response_time)
+        return super().build_result(path, url, status, headers, content_length, response_time)
+
+
+def measure_case(base_url, wordlist, threads, scan_type, engine, options):
+    """Run one scan in this (fresh) process and return its throughput, latency, memory and CPU figures"""
+    scanner = MeasuredScanner(base_url, wordlist, threads=threads, engine=engine, **options)
+    scanner.latencies = []
+    scanner.console = Console(quiet=True)
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    scanner.run(scan_type)
+    duration = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    latencies = sorted(scanner.latencies)
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    requests = max(scanner.total_requests, 1)
+    return {
+        'scan_type': scan_type, 'engine': engine, 'threads': threads,
+        'requests': scanner.total_requests, 'duration': duration, 'rps': scanner.total_requests / duration,
+        'p50_ms': quantiles[49] * 1000 if quantiles else 0, 'p99_ms': quantiles[98] * 1000 if quantiles else 0,
+        'peak_rss_mb': after.ru_maxrss / 1024, 'cpu_us_per_request': cpu / requests * 1e6,
+        'found': len(scanner.results['found']), 'soft_404_filtered': scanner.soft_404_filtered,
+    }
+
+
+def run_scan(base_url, wordlist, threads, scan_type, console=None, **options):
+    """Run one scan, quiet unless a console is given, and return the scanner"""
+    scanner = AdvancedScanner(base_url, wordlist, threads=threads, **options)
+    scanner.console = console or Console(quiet=True)
+    scanner.run(scan_type)
+    return scanner
+
+
+def bench_requests(args):
+    """Compare requests issued by the single-pass full scan and the legacy two-pass scan"""
+    console = Console()
+    server, base_url = start_target()
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title="Requests per full scan", header_style="bold cyan", border_style="cyan")
+    table.add_column("Mode", style="cyan")
+    table.add_column("GET requests", justify="right")
+    table.add_column("Admin panels", justify="right")
+    table.add_column("Found", justify="right")
+    table.add_column("Duration", justify="right")
+
+    try:
+        server.requests.clear()
+        start = time.perf_counter()
+        legacy_admin = 0
+        legacy_found = 0
+        for scan_type in ['directories', 'admin']:
+            scanner = run_scan(base_url, wordlist, args.threads, scan_type)
+            legacy_admin += len(scanner.results['admin_panels'])
+            legacy_found += len(scanner.results['found'])
+        legacy_duration = time.perf_counter() - start
+        legacy_gets = server.requests['GET']
+        table.add_row("two-pass (legacy)", str(legacy_gets), str(legacy_admin), str(legacy_found), f"{legacy_duration:.2f}s")
+
+        server.requests.clear()
+        start = time.perf_counter()
+        scanner = run_scan(base_url, wordlist, args.threads, 'full')
+        duration = time.perf_counter() - start
+        gets = server.requests['GET']
+        table.add_row("single-pass", str(gets), str(len(scanner.results['admin_panels'])),
+                      str(len(scanner.results['found'])), f"{duration:.2f}s")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+    console.print(f"[green]Request reduction: {legacy_gets / max(gets, 1):.2f}x[/green]")
+
+
+def bench_throughput(args):
+    """Compare requests/sec of the thread and async engines at several concurrency levels"""
+    console = Console()
+    server, base_url = start_target(latency=args.latency / 1000)
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title=f"Engine throughput ({args.latency:.0f} ms server latency)",
+                  header_style="bold cyan", border_style="cyan")
+    table.add_column("Engine", style="cyan")
+    table.add_column("Concurrency", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Req/s", justify="right", style="green")
+
+    try:
+        for concurrency in args.concurrency:
+            for engine in args.engines:
+                start = time.perf_counter()
+                scanner = run_scan(base_url, wordlist, concurrency, 'full', engine=engine)
+                duration = time.perf_counter() - start
+                table.add_row(engine, str(concurrency), str(scanner.total_requests),
+                              str(len(scanner.results['errors'])), f"{duration:.2f}s",
+                              f"{scanner.total_requests / duration:.0f}")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_ui(args):
+    """Requests/sec with the live display off and drawn to a terminal, and what the drawing cost"""
+    console = Console()
+    server, base_url = start_target(latency=args.latency / 1000)
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title=f"Live display cost ({args.latency:.0f} ms server latency)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Engine", style="cyan")
+    table.add_column("Threads", justify="right")
+    table.add_column("Req/s quiet", justify="right")
+    table.add_column("Req/s live", justify="right", style="green")
+    table.add_column("Refreshes", justify="right")
+    table.add_column("UI time", justify="right")
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            for threads in args.threads:
+                rates = []
+                for live in [False, True]:
+                    terminal = Console(file=devnull, force_terminal=True, width=120) if live else None
+                    start = time.perf_counter()
+                    scanner = run_scan(base_url, wordlist, threads, 'full', console=terminal, engine=args.engine,
+                                       refresh_per_second=args.refresh)
+                    rates.append(scanner.total_requests / (time.perf_counter() - start))
+                table.add_row(args.engine, str(threads), f"{rates[0]:.0f}", f"{rates[1]:.0f}", str(scanner.live.frames),
+                              f"{scanner.live.seconds * 1000:.1f} ms")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_startup(args):
+    """Import time of haider with lazy imports vs the modules it used to load eagerly, and cold start to first request"""
+    console = Console()
+    server, base_url = start_target(StampingHandler)
+    wordlist = write_wordlist(args.paths)
+    here = os.path.dirname(os.path.abspath(__file__))
+    workdir = tempfile.mkdtemp(prefix='bench_startup_')
+    env = dict(os.environ, PYTHONPATH=here)
+    eager = "import haider, aiohttp, webbrowser, rich.progress, rich.syntax, rich.layout, rich.traceback, rich.prompt"
+
+    def timed(command):
+        samples = []
+        for _ in range(args.rounds):
+            server.first_seen = None
+            start = time.perf_counter()
+            subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            samples.append(((server.first_seen or time.perf_counter()) - start) * 1000)
+        return statistics.median(samples)
+
+    table = Table(title=f"Cold start (median of {args.rounds} runs)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Measurement", style="cyan")
+    table.add_column("Time", justify="right", style="green")
+
+    try:
+        table.add_row("python startup", f"{timed([sys.executable, '-c', 'pass']):.0f} ms")
+        table.add_row("import haider", f"{timed([sys.executable, '-c', 'import haider']):.0f} ms")
+        table.add_row("import haider + formerly eager modules", f"{timed([sys.executable, '-c', eager]):.0f} ms")
+        table.add_row("haider.py --headless to first request",
+                      f"{timed([sys.executable, os.path.join(here, 'haider.py'), '--headless', '-u', base_url, '-w', wordlist, '--no-stats', '--no-save', '--no-wordlist-cache', '--tech', 'off']):.0f} ms")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    console.print(table)
+
+
+def bench_suite(args):
+    """Scanner throughput, latency, peak RSS and CPU per request across thread counts, scan types and engines,
+    each case in a fresh process against one simulated target"""
+    console = Console()
+    server, base_url = start_simulator(args)
+    wordlist = write_suite_wordlist(args.paths, args.seed)
+    options = {'wordlist_cache': False, 'stats_path': None, 'tech_mode': 'off', 'max_rps': args.max_rps}
+    context = multiprocessing.get_context('spawn')
+
+    scenario = (f"{args.latency_dist} {args.latency:.0f} ms, {args.body_kb} KB bodies, redirect chain {args.redirect_chain}"
+                + (", wildcard" if args.wildcard else "") + (f", 429 above {args.throttle_rps} req/s" if args.throttle_rps else ""))
+    table = Table(title=f"Benchmark suite ({scenario})", header_style="bold cyan", border_style="cyan")
+    for column in ["Scan", "Engine", "Threads", "Requests", "Req/s", "p50", "p99", "Peak RSS", "CPU/req"]:
+        table.add_column(column, justify="left" if column in ["Scan", "Engine"] else "right")
+    if args.compare:
+        table.add_column("vs baseline", justify="right")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(case['scan_type'], case['engine'], case['threads']): case for case in json.load(f)['cases']}
+
+    cases = []
+    regressions = 0
+    try:
+        for scan_type in args.scan_types:
+            for engine in args.engines:
+                for threads in args.threads:
+                    server.bucket = args.throttle_rps
+                    server.bucket_time = time.monotonic()
+                    with context.Pool(1) as pool:
+                        case = pool.apply(measure_case, (base_url, wordlist, threads, scan_type, engine, options))
+                    cases.append(case)
+                    row = [scan_type, engine, str(threads), str(case['requests']), f"{case['rps']:.0f}",
+                           f"{case['p50_ms']:.1f} ms", f"{case['p99_ms']:.1f} ms", f"{case['peak_rss_mb']:.0f} MB",
+                           f"{case['cpu_us_per_request']:.0f} µs"]
+                    previous = baseline.get((scan_type, engine, threads))
+                    if args.compare:
+                        if previous:
+                            change = (case['rps'] - previous['rps']) / previous['rps'] * 100
+                            regressed = change < -args.tolerance
+                            regressions += regressed
+                            row.append(f"[{'red' if regressed else 'green'}]{change:+.1f}%[/]")
+                        else:
+                            row.append("-")
+                    table.add_row(*row)
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'scenario': {name: getattr(args, name) for name in
+                                    ['paths', 'latency', 'latency_dist', 'sigma', 'seed', 'wildcard', 'body_kb',
+                                     'redirect_chain', 'throttle_rps', 'max_rps']},
+                       'cases': cases}, f, indent=4)
+        console.print(f"[green]✓ Results written to {args.output}[/green]")
+    if regressions:
+        console.print(f"[red]✗ {regressions} case(s) lost more than {args.tolerance:.0f}% req/s against {args.compare}[/red]")
+        sys.exit(1)
+
+
+def bench_pool(args):
+    """Compare the requests default pool (10 connections) with a pool sized to the thread count"""
+    console = Console()
+    tls = None
+    cert_dir = tempfile.mkdtemp(prefix='bench_tls_')
+    if not args.plain_http:
+        if shutil.which('openssl') is None:
+            console.print("[yellow]! openssl not found, benchmarking over plain HTTP[/yellow]")
+        else:
+            tls = make_certificate(cert_dir)
+    server, base_url = start_target(latency=args.latency / 1000, tls=tls)
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title=f"Connection pool ({base_url.split(':')[0].upper()}, {args.threads} threads)",
+                  header_style="bold cyan", border_style="cyan")
+    table.add_column("Pool size", style="cyan")
+    table.add_column("Opened", justify="right")
+    table.add_column("Reused", justify="right")
+    table.add_column("Discarded", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Req/s", justify="right", style="green")
+
+    try:
+        for pool_size in [10, args.threads]:
+            start = time.perf_counter()
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', pool_size=pool_size, verify_ssl=False)
+            duration = time.perf_counter() - start
+            stats = scanner.connection_stats
+            table.add_row(str(pool_size), str(stats.opened), str(stats.reused), str(stats.discarded),
+                          f"{duration:.2f}s", f"{scanner.total_requests / duration:.0f}")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+        shutil.rmtree(cert_dir, ignore_errors=True)
+
+    console.print(table)
+
+
+def bench_phases(args):
+    """Median time per request phase with and without keep-alive, against a known server latency"""
+    console = Console()
+    tls = None
+    cert_dir = tempfile.mkdtemp(prefix='bench_tls_')
+    if not args.plain_http:
+        if shutil.which('openssl') is None:
+            console.print("[yellow]! openssl not found, benchmarking over plain HTTP[/yellow]")
+        else:
+            tls = make_certificate(cert_dir)
+    server, base_url = start_target(latency=args.latency / 1000, tls=tls)
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title=f"Request phases, p50 in ms ({base_url.split(':')[0].upper()}, {args.latency:.0f} ms server latency)",
+                  header_style="bold cyan", border_style="cyan")
+    table.add_column("Engine", style="cyan")
+    table.add_column("Keep-alive")
+    for phase in RequestMetrics.PHASES:
+        table.add_column(phase, justify="right")
+
+    try:
+        for engine in args.engines:
+            for keep_alive in [True, False]:
+                scanner = run_scan(base_url, wordlist, args.threads, 'full', engine=engine, keep_alive=keep_alive,
+                                   verify_ssl=False)
+                phases = dict(scanner.metrics.by_phase())
+                table.add_row(engine, "yes" if keep_alive else "no",
+                              *[f"{phases[phase].quantile(0.5) * 1000:.2f}" if phase in phases else "-"
+                                for phase in RequestMetrics.PHASES])
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+        shutil.rmtree(cert_dir, ignore_errors=True)
+
+    console.print(table)
+
+
+def bench_probe(args):
+    """Compare bytes transferred by the get, head and stream probe modes on large pages"""
+    console = Console()
+    server, base_url = start_target(LargePageHandler)
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title="Probe modes (100 KB not-found pages)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Probe mode", style="cyan")
+    table.add_column("HEAD", justify="right")
+    table.add_column("GET", justify="right")
+    table.add_column("Body bytes", justify="right")
+    table.add_column("Saved", justify="right")
+    table.add_column("Found", justify="right")
+    table.add_column("Duration", justify="right")
+
+    try:
+        for mode in args.modes:
+            server.requests.clear()
+            server.bytes_sent = 0
+            start = time.perf_counter()
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', probe_mode=mode)
+            duration = time.perf_counter() - start
+            table.add_row(mode, str(server.requests['HEAD']), str(server.requests['GET']),
+                          scanner.format_bytes(scanner.bytes_received), scanner.format_bytes(scanner.bytes_saved),
+                          str(len(scanner.results['found'])), f"{duration:.2f}s")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_throttle(args):
+    """Scan a target that enforces a request rate, with and without the adaptive limiter"""
+    console = Console()
+    server, base_url = start_target(ThrottlingHandler, latency=args.latency / 1000)
+    server.bucket_lock = threading.Lock()
+    server.allowed_rate = args.allowed_rate
+    wordlist = write_wordlist(args.paths)
+
+    table = Table(title=f"Throttled target ({args.allowed_rate} req/s allowed)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Limiter", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("429s", justify="right")
+    table.add_column("Found", justify="right")
+    table.add_column("Final rate", justify="right")
+    table.add_column("Duration", justify="right")
+
+    try:
+        for max_rps in [0, args.max_rps]:
+            server.requests.clear()
+            server.bucket = args.allowed_rate
+            server.bucket_time = time.monotonic()
+            start = time.perf_counter()
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', max_rps=max_rps, soft_404=False)
+            duration = time.perf_counter() - start
+            limiter = scanner.rate_limiter
+            table.add_row(f"adaptive ({max_rps} req/s max)" if limiter else "none",
+                          str(scanner.total_requests), str(server.requests['429']),
+                          f"{len(scanner.results['found'])}/4",
+                          f"{limiter.rate:.0f} req/s" if limiter else "-", f"{duration:.2f}s")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_tech(args):
+    """Requests needed to reach the admin panel of a PHP/WordPress target with and without technology pruning"""
+    console = Console()
+    server, base_url = start_target(WordPressHandler)
+    server.order_lock = threading.Lock()
+    wordlist = write_mixed_wordlist(args.paths)
+
+    table = Table(title="Technology-aware ordering (PHP + WordPress target)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Requests to /wp-admin/", justify="right")
+    table.add_column("Total requests", justify="right")
+    table.add_column("Admin panels", justify="right")
+    table.add_column("Pruned", justify="right")
+
+    try:
+        for mode in ['off', 'promote', 'prune']:
+            server.requests.clear()
+            server.first_request = {}
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', tech_mode=mode, wordlist_cache=False)
+            table.add_row(mode, str(server.first_request.get('/wp-admin/', '-')), str(scanner.total_requests),
+                          str(len(scanner.results['admin_panels'])), str(scanner.tech.pruned))
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_goal(args):
+    """Requests spent finding the first admin panel: full scan vs early stop, file vs prior order"""
+    console = Console()
+    server, base_url = start_target(WordPressHandler)
+    server.order_lock = threading.Lock()
+    wordlist = write_mixed_wordlist(args.paths)
+
+    table = Table(title="Goal-directed scan (stop after 1 admin panel)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Admin panels", justify="right")
+    table.add_column("Duration", justify="right")
+
+    try:
+        for label, options in [("full scan", {}), ("early stop, file order", {'stop_after': 1, 'order': 'file'}),
+                               ("early stop, prior order", {'stop_after': 1})]:
+            server.requests.clear()
+            server.first_request = {}
+            start = time.perf_counter()
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', tech_mode='off', engine=args.engine, **options)
+            duration = time.perf_counter() - start
+            table.add_row(label, str(scanner.total_requests), str(len(scanner.results['admin_panels'])), f"{duration:.2f}s")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+
+    console.print(table)
+
+
+def bench_learn(args):
+    """Requests to the first admin panel on a cold vs warm learned path statistics database"""
+    console = Console()
+    server, base_url = start_target(PortalHandler)
+    directory = tempfile.mkdtemp(prefix='bench_stats_')
+    fd, wordlist = tempfile.mkstemp(suffix='.txt', prefix='bench_wordlist_')
+    with os.fdopen(fd, 'w') as f:
+        for i in range(args.paths):
+            if i == args.paths * 9 // 10:
+                f.write("/team/gate\n")
+            f.write(f"/page_{i}\n")
+
+    table = Table(title="Learned path statistics (stop after 1 admin panel)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Run", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Learned paths", justify="right")
+    table.add_column("Duration", justify="right")
+
+    try:
+        stats_path = os.path.join(directory, 'path_stats.db')
+        for label in ["cold (no history)", "warm (after one scan)"]:
+            start = time.perf_counter()
+            scanner = run_scan(base_url, wordlist, args.threads, 'full', tech_mode='off', stop_after=1,
+                               stats_path=stats_path, wordlist_cache=False)
+            duration = time.perf_counter() - start
+            table.add_row(label, str(scanner.total_requests), str(len(scanner.learned)), f"{duration:.2f}s")
+    finally:
+        server.shutdown()
+        os.remove(wordlist)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    console.print(table)
+
+
+def bench_matcher(args):
+    """Per-response keyword matching cost as the rule set grows, against one substring test per keyword
+    and against the Aho-Corasick automaton alone on the body keywords"""
+    console = Console()
+    rng = random.Random(1)
+    body = ''.join(rng.choice(string.ascii_lowercase + ' <>/="') for _ in range(args.body_kb * 1024))
+    path = '/' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(12)) + '.php'
+
+    table = Table(title=f"Keyword matching ({args.body_kb} KB body)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Rules", style="cyan", justify="right")
+    table.add_column("Body keywords", justify="right")
+    table.add_column("Matcher", justify="right")
+    table.add_column("Substring loop", justify="right")
+    table.add_column("Automaton", justify="right")
+
+    for count in args.rules:
+        keywords = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(count)]
+        rules = [(['admin', 'backup', 'interesting'][i % 3], keyword) for i, keyword in enumerate(keywords)]
+        matcher = KeywordMatcher(rules)
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            matcher.match(path, body)
+        matched = (time.perf_counter() - start) / args.rounds
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            text, lowered = body.lower(), path.lower()
+            [kw for category, kw in rules if kw in (text if category == 'admin' else lowered)]
+        looped = (time.perf_counter() - start) / args.rounds
+
+        body_keywords = [kw for category, kw in rules if category == 'admin']
+        automaton = AhoCorasick(body_keywords)
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            automaton.search(body.lower())
+        automated = (time.perf_counter() - start) / args.rounds
+
+        search = 'automaton' if len(body_keywords) > KeywordSearch.LOOP_LIMIT else 'loop'
+        table.add_row(str(count), f"{len(body_keywords)} ({search})", f"{matched * 1000:.2f} ms",
+                      f"{looped * 1000:.2f} ms", f"{automated * 1000:.2f} ms")
+
+    console.print(table)
+
+
+def bench_wordlist(args):
+    """Startup and full-iteration cost of the text wordlist against its compiled, memory-mapped form"""
+    console = Console()
+    cache_dir = tempfile.mkdtemp(prefix='bench_wordlist_cache_')
+    fd, wordlist = tempfile.mkstemp(suffix='.txt', prefix='bench_wordlist_')
+    with os.fdopen(fd, 'w') as f:
+        for i in range(args.lines):
+            f.write(f"/path_{i % (args.lines - args.lines // 10)}\n")
+
+    def measure(**options):
+        scanner = AdvancedScanner("http://127.0.0.1", wordlist, wordlist_cache_dir=cache_dir, **options)
+        start = time.perf_counter()
+        scanner.estimate_wordlist_size()
+        next(scanner.load_wordlist())
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        count = sum(1 for _ in scanner.load_wordlist())
+        return startup, time.perf_counter() - start, count
+
+    table = Table(title=f"Wordlist loading ({args.lines:,} lines, 10% duplicates)", header_style="bold cyan", border_style="cyan")
+    table.add_column("Source", style="cyan")
+    table.add_column("Startup", justify="right")
+    table.add_column("Full pass", justify="right")
+    table.add_column("Paths", justify="right")
+
+    try:
+        for label, options in [("text", {'wordlist_cache': False}), ("compiled (first run)", {}), ("compiled (cached)", {})]:
+            startup, full, count = measure(**options)
+            table.add_row(label, f"{startup * 1000:.1f} ms", f"{full:.2f}s", f"{count:,}")
+    finally:
+        os.remove(wordlist)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Haider Tools benchmarks against a local HTTP stand-in")
+    parser.add_argument('--paths', type=int, default=1000, help="wordlist size")
+    subparsers = parser.add_subparsers(dest='bench', required=True)
+
+    requests_parser = subparsers.add_parser('requests', help="single-pass vs two-pass request count")
+    requests_parser.add_argument('--threads', type=int, default=20, help="worker threads")
+    requests_parser.set_defaults(func=bench_requests)
+
+    throughput_parser = subparsers.add_parser('throughput', help="thread vs async engine requests/sec")
+    throughput_parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+    throughput_parser.add_argument('--engines', nargs='+', default=['thread', 'async'])
+    throughput_parser.add_argument('--latency', type=float, default=100, help="server latency in ms")
+    throughput_parser.set_defaults(func=bench_throughput)
+
+    ui_parser = subparsers.add_parser('ui', help="requests/sec with and without the live display, and its refresh cost")
+    ui_parser.add_argument('--threads', type=int, nargs='+', default=[50, 200, 500])
+    ui_parser.add_argument('--engine', default='thread', choices=['thread', 'async'])
+    ui_parser.add_argument('--latency', type=float, default=5, help="server latency in ms")
+    ui_parser.add_argument('--refresh', type=float, default=2, help="live display refreshes per second")
+    ui_parser.set_defaults(func=bench_ui)
+
+    suite_parser = subparsers.add_parser('suite', help="req/s, p50/p99 latency, peak RSS and CPU per request against a simulated target")
+    suite_parser.add_argument('--threads', type=int, nargs='+', default=[10, 50, 200])
+    suite_parser.add_argument('--scan-types', nargs='+', default=['full', 'directories'], choices=['full', 'directories', 'admin'])
+    suite_parser.add_argument('--engines', nargs='+', default=['thread'], choices=['thread', 'async'])
+    suite_parser.add_argument('--latency', type=float, default=20, help="mean server latency in ms")
+    suite_parser.add_argument('--latency-dist', default='lognormal', choices=['fixed', 'uniform', 'exponential', 'lognormal'])
+    suite_parser.add_argument('--sigma', type=float, default=0.8, help="spread of the lognormal latency distribution")
+    suite_parser.add_argument('--seed', type=int, default=1, help="seed for the wordlist order and latency samples")
+    suite_parser.add_argument('--wildcard', action='store_true', help="answer unknown paths with a 200 catch-all page")
+    suite_parser.add_argument('--body-kb', type=int, default=16, help="padding added to not-found and catch-all bodies")
+    suite_parser.add_argument('--redirect-chain', type=int, default=3, help="hops before a /hop_N entry lands")
+    suite_parser.add_argument('--throttle-rps', type=int, default=0, help="answer 429 above this rate, 0 to disable")
+    suite_parser.add_argument('--max-rps', type=float, default=0, help="scanner rate limiter ceiling, needed to recover from 429s")
+    suite_parser.add_argument('--output', help="write the results as JSON for later --compare")
+    suite_parser.add_argument('--compare', help="JSON results of an earlier run; exit 1 if req/s regressed")
+    suite_parser.add_argument('--tolerance', type=float, default=10, help="req/s loss in percent tolerated by --compare")
+    suite_parser.set_defaults(func=bench_suite)
+
+    startup_parser = subparsers.add_parser('startup', help="import time and cold start to first request")
+    startup_parser.add_argument('--rounds', type=int, default=5)
+    startup_parser.set_defaults(func=bench_startup)
+
+    pool_parser = subparsers.add_parser('pool', help="default vs thread-sized connection pool")
+    pool_parser.add_argument('--threads', type=int, default=50, help="worker threads")
+    pool_parser.add_argument('--latency', type=float, default=5, help="server latency in ms")
+    pool_parser.add_argument('--plain-http', action='store_true', help="skip TLS")
+    pool_parser.set_defaults(func=bench_pool)
+
+    phases_parser = subparsers.add_parser('phases', help="median dns/connect/tls/ttfb/body/classify time per request")
+    phases_parser.add_argument('--threads', type=int, default=20)
+    phases_parser.add_argument('--engines', nargs='+', default=['thread', 'async'], choices=['thread', 'async'])
+    phases_parser.add_argument('--latency', type=float, default=20, help="server latency in ms")
+    phases_parser.add_argument('--plain-http', action='store_true', help="skip TLS")
+    phases_parser.set_defaults(func=bench_phases)
+
+    probe_parser = subparsers.add_parser('probe', help="bytes transferred per probe mode")
+    probe_parser.add_argument('--threads', type=int, default=20, help="worker threads")
+    probe_parser.add_argument('--modes', nargs='+', default=['get', 'head', 'stream'])
+    probe_parser.set_defaults(func=bench_probe)
+
+    throttle_parser = subparsers.add_parser('throttle', help="429-throttled target with and without the adaptive limiter")
+    throttle_parser.add_argument('--threads', type=int, default=50, help="worker threads")
+    throttle_parser.add_argument('--allowed-rate', type=int, default=200, help="server rate before 429")
+    throttle_parser.add_argument('--max-rps', type=int, default=1000, help="limiter ceiling")
+    throttle_parser.add_argument('--latency', type=float, default=10, help="server latency in ms")
+    throttle_parser.set_defaults(func=bench_throttle)
+
+    tech_parser = subparsers.add_parser('tech', help="requests to reach the admin panel with technology-aware ordering")
+    tech_parser.add_argument('--threads', type=int, default=20, help="worker threads")
+    tech_parser.set_defaults(func=bench_tech)
+
+    goal_parser = subparsers.add_parser('goal', help="requests to the first admin panel with early stop and prior ordering")
+    goal_parser.add_argument('--threads', type=int, default=20, help="worker threads")
+    goal_parser.add_argument('--engine', default='thread', choices=['thread', 'async'])
+    goal_parser.set_defaults(func=bench_goal)
+
+    learn_parser = subparsers.add_parser('learn', help="requests to the first admin panel before and after learning path statistics")
+    learn_parser.add_argument('--threads', type=int, default=20, help="worker threads")
+    learn_parser.set_defaults(func=bench_learn)
+
+    matcher_parser = subparsers.add_parser('matcher', help="keyword matching cost per response as rules grow")
+    matcher_parser.add_argument('--rules', type=int, nargs='+', default=[10, 100, 500, 1000])
+    matcher_parser.add_argument('--body-kb', type=int, default=100, help="response body size in KB")
+    matcher_parser.add_argument('--rounds', type=int, default=5)
+    matcher_parser.set_defaults(func=bench_matcher)
+
+    wordlist_parser = subparsers.add_parser('wordlist', help="text vs compiled wordlist startup time")
+    wordlist_parser.add_argument('--lines', type=int, default=5_000_000)
+    wordlist_parser.set_defaults(func=bench_wordlist)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,1686 @@
 import requests
 import os
+import argparse
+import asyncio
 import logging
-import webbrowser
 import time
 import json
 import csv
 import re
+import uuid
+import zlib
+import textwrap
+import queue
+import sqlite3
+import socket
+import math
+import hashlib
+import html
+import heapq
+import ipaddress
+import itertools
+import mmap
+import posixpath
+import struct
+import sys
+import threading
+from array import array
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
-from collections import defaultdict
-from tqdm import tqdm
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn
+from collections import defaultdict, deque, Counter
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.retry import Retry
+from contextlib import nullcontext
+from rich.console import Console, Group
 from rich.table import Table
 from rich.live import Live
-from rich.prompt import Prompt
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.layout import Layout
-from rich.traceback import install as install_rich_traceback
-from rich.align import Align
 
-install_rich_traceback()
+# Imported on first use of the async engine, it is the slowest import by far
+aiohttp = None
+
+def load_aiohttp():
+    """Import aiohttp the first time the async engine is used, None if it is not installed"""
+    global aiohttp
+    if aiohttp is None:
+        try:
+            import aiohttp as module
+        except ImportError:
+            return None
+        aiohttp = module
+    return aiohttp
+
+def open_in_browser(url):
+    import webbrowser
+    webbrowser.open(url)
+
+class DigestSet:
+    """Exact duplicate filter storing 64-bit digests instead of the strings themselves"""
+    def __init__(self):
+        self.digests = set()
+
+    def digest(self, item):
+        return int.from_bytes(hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+    def add(self, item):
+        """Add an item, True if it was not seen before"""
+        digest = self.digest(item)
+        if digest in self.digests:
+            return False
+        self.digests.add(digest)
+        return True
+
+    def __contains__(self, item):
+        return self.digest(item) in self.digests
+
+    def __len__(self):
+        return len(self.digests)
+
+class BloomFilter:
+    """Fixed-size probabilistic duplicate filter, may drop a few unique items"""
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item):
+        """Add an item, True if it was (probably) not seen before"""
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        new = False
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+class CompiledWordlist:
+    """Deduplicated wordlist compiled to a memory-mapped file: header, newline-separated paths, uint64 offsets"""
+    MAGIC = b'HWL1'
+    # magic, source size, source mtime_ns, path count, duplicates dropped, offsets position, source digest
+    HEADER = struct.Struct('<4sQqQQQ16s')
+    MTIME_AT = 12
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.source_size, self.source_mtime, self.count, self.duplicates,
+         self.offsets_at, self.digest) = self.HEADER.unpack_from(self.map)
+        if magic != self.MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not a compiled wordlist")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        start, end = struct.unpack_from('<2Q', self.map, self.offsets_at + index * 8)
+        return self.map[start:end - 1].decode('utf-8', errors='replace')
+
+    def __iter__(self):
+        position, end = self.HEADER.size, self.paths_end
+        pending = b''
+        while position < end:
+            chunk = self.map[position:min(position + (1 << 20), end)]
+            position += len(chunk)
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line.decode('utf-8', errors='replace')
+
+    @property
+    def paths_end(self):
+        return struct.unpack_from('<Q', self.map, self.offsets_at + self.count * 8)[0]
+
+    def close(self):
+        self.map.close()
+
+    def matches(self, stat):
+        """True if the compiled file still reflects the source described by stat"""
+        return (self.source_size, self.source_mtime) == (stat.st_size, stat.st_mtime_ns)
+
+    def refresh(self, mtime):
+        """Record a new source mtime after the content was found unchanged"""
+        with open(self.path, 'r+b') as file:
+            file.seek(self.MTIME_AT)
+            file.write(struct.pack('<q', mtime))
+        self.source_mtime = mtime
+
+    @staticmethod
+    def file_digest(path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    @staticmethod
+    def read_lines(file, digest):
+        """Raw lines of a binary file in 1 MB chunks, feeding every chunk to digest"""
+        pending = b''
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            yield lines
+        if pending:
+            yield [pending]
+
+    @classmethod
+    def compile(cls, source, target):
+        """Strip, drop comments and deduplicate a text wordlist into target, replacing it atomically"""
+        stat = os.stat(source)
+        digest = hashlib.blake2b(digest_size=16)
+        # Built-in hashes are enough here, the set only lives for the duration of one compile
+        seen = set()
+        offsets = array('Q')
+        duplicates = 0
+        temporary = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(source, 'rb') as src, open(temporary, 'wb') as out:
+                out.write(bytes(cls.HEADER.size))
+                position = cls.HEADER.size
+                for lines in cls.read_lines(src, digest):
+                    words = []
+                    for line in lines:
+                        word = line.strip()
+                        if not word or word[:1] == b'#':
+                            continue
+                        key = hash(word)
+                        if key in seen:
+                            duplicates += 1
+                            continue
+                        seen.add(key)
+                        offsets.append(position)
+                        position += len(word) + 1
+                        words.append(word)
+                    if words:
+                        out.write(b'\n'.join(words) + b'\n')
+                offsets.append(position)
+                padding = -position % 8
+                out.write(bytes(padding))
+                if sys.byteorder != 'little':
+                    offsets.byteswap()
+                out.write(offsets.tobytes())
+                out.seek(0)
+                out.write(cls.HEADER.pack(cls.MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) - 1,
+                                          duplicates, position + padding, digest.digest()))
+            os.replace(temporary, target)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+def wordlist_cache_dir():
+    """Per-user directory holding compiled wordlists"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'haider')
+
+def open_compiled_wordlist(source, cache_dir=None):
+    """Compiled form of a wordlist, compiled on first use or when the source changed"""
+    stat = os.stat(source)
+    cache_dir = cache_dir or wordlist_cache_dir()
+    name = hashlib.blake2b(os.path.abspath(source).encode(), digest_size=8).hexdigest()
+    target = os.path.join(cache_dir, f"{name}.hwl")
+    try:
+        compiled = CompiledWordlist(target)
+    except (OSError, ValueError, struct.error):
+        compiled = None
+    
+    if compiled is not None:
+        if compiled.matches(stat):
+            return compiled
+        # Touched but unchanged, e.g. after a checkout: keep the compiled file
+        if compiled.source_size == stat.st_size and compiled.digest == CompiledWordlist.file_digest(source):
+            compiled.refresh(stat.st_mtime_ns)
+            return compiled
+        compiled.close()
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    CompiledWordlist.compile(source, target)
+    return CompiledWordlist(target)
+
+class WordlistMutator:
+    """Lazily expands wordlist entries with weighted extensions, case variants and templates"""
+    CASES = {'lower': str.lower, 'upper': str.upper, 'capitalize': str.capitalize, 'title': str.title}
+
+    def __init__(self, extensions=(), cases=(), templates=(), word_weight=1.0):
+        self.mutations = [('word', None, word_weight)]
+        self.mutations += [('extension', extension, weight) for extension, weight in extensions]
+        for case, weight in cases:
+            if case not in self.CASES:
+                raise ValueError(f"unknown case variant {case!r}, expected one of {', '.join(self.CASES)}")
+            self.mutations.append(('case', case, weight))
+        for template, weight in templates:
+            if '{word}' not in template:
+                raise ValueError(f"template {template!r} has no {{word}} placeholder")
+            self.mutations.append(('template', template, weight))
+        if any(weight <= 0 for _, _, weight in self.mutations):
+            raise ValueError("mutation weights must be positive")
+
+    def __bool__(self):
+        return len(self.mutations) > 1
+
+    def variants(self, kind, value, word):
+        """Paths one mutation makes from one wordlist entry, possibly none"""
+        if kind == 'word':
+            return (word,)
+        lead = '/' if word.startswith('/') else ''
+        core = word.strip('/')
+        if not core:
+            return ()
+        if kind == 'extension':
+            if word.endswith('/') or '.' in core.rsplit('/', 1)[-1]:
+                return ()
+            return (word + value,)
+        if kind == 'case':
+            variant = self.CASES[value](word)
+            return (variant,) if variant != word else ()
+        return (lead + value.replace('{word}', core),)
+
+    def stream(self, kind, value, words):
+        for word in words:
+            yield from self.variants(kind, value, word)
+
+    def expand(self, open_words, seen, stats):
+        """Merge one lazy stream per mutation, each advancing at a rate proportional to its weight"""
+        # Stride scheduling: the stream with the lowest virtual time emits next, then moves 1/weight ahead
+        heap = [(0.0, index, self.stream(kind, value, open_words(index == 0)), 1.0 / weight)
+                for index, (kind, value, weight) in enumerate(self.mutations)]
+        heapq.heapify(heap)
+        while heap:
+            virtual_time, index, stream, stride = heap[0]
+            path = next(stream, None)
+            if path is None:
+                heapq.heappop(heap)
+                continue
+            heapq.heapreplace(heap, (virtual_time + stride, index, stream, stride))
+            if not seen.add(path):
+                stats['duplicates'] += 1
+                continue
+            stats['paths'] += 1
+            yield path
+
+    def factor(self, sample):
+        """Average paths produced per wordlist entry, measured on a sample"""
+        sample = list(sample)
+        if not sample:
+            return 1.0
+        produced = sum(len(self.variants(kind, value, word)) for word in sample for kind, value, _ in self.mutations)
+        return produced / len(sample)
+
+def parse_weighted(spec, default_weight):
+    """Split 'value:weight' into (value, float weight); a value without a numeric suffix gets default_weight"""
+    value, _, weight = spec.rpartition(':')
+    try:
+        return value, float(weight)
+    except ValueError:
+        return spec, default_weight
+
+def simhash(text, bits=64):
+    """64-bit simhash over the word tokens of a body"""
+    weights = [0] * bits
+    mask = (1 << bits) - 1
+    for token in set(text.split()):
+        h = hash(token) & mask
+        for i in range(bits):
+            weights[i] += 1 if h >> i & 1 else -1
+    return sum(1 << i for i in range(bits) if weights[i] > 0)
+
+class ResponseFingerprint:
+    """Shape of a response used to recognise catch-all (soft-404) pages"""
+    SMALL_BODY = 1024
+    
+    def __init__(self, status, body, location=''):
+        self.status = status
+        self.length = len(body)
+        self.words = body.count(' ')
+        self.lines = body.count('\n')
+        self.location = location
+        # Too few tokens for a meaningful simhash; digit runs (timestamps, request ids) are collapsed first
+        self.digest = hashlib.blake2b(re.sub(r'\d+', '0', body).encode('utf-8', 'surrogatepass'),
+                                      digest_size=16).digest() if self.length < self.SMALL_BODY else None
+        self._simhash = None
+        self._body = body
+
+    @property
+    def simhash(self):
+        if self._simhash is None:
+            self._simhash = simhash(self._body[:65536])
+            self._body = None
+        return self._simhash
+
+    def similar(self, other, max_distance=6):
+        """Cheap shape checks first, then the digest for small bodies or simhash distance for large ones"""
+        if self.status != other.status:
+            return False
+        if self.location or other.location:
+            return self.location == other.location
+        if self.digest is not None and other.digest is not None:
+            return abs(self.length - other.length) <= 32 and self.digest == other.digest
+        if abs(self.length - other.length) > max(32, other.length // 20) and \
+                (self.words != other.words or self.lines != other.lines):
+            return False
+        return bin(self.simhash ^ other.simhash).count('1') <= max_distance
+
+class SoftNotFoundBaseline:
+    """Fingerprints of random non-existent paths under one directory, indexed by status"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.by_status = defaultdict(list)
+
+    def add(self, fingerprint):
+        for known in self.by_status[fingerprint.status]:
+            if fingerprint.similar(known):
+                return
+        self.by_status[fingerprint.status].append(fingerprint)
+
+    @property
+    def wildcard_statuses(self):
+        return sorted(status for status in self.by_status if status != 404)
+
+    def matches(self, fingerprint):
+        return any(fingerprint.similar(known) for known in self.by_status.get(fingerprint.status, ()))
+
+def trie_pattern(words):
+    """Regex alternation of words with common prefixes factored out, longest word wins at a position"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + pattern + ')?' if '' in node else pattern
+    
+    return build(trie)
+
+class AhoCorasick:
+    """Aho-Corasick automaton: every keyword in a text, overlapping ones included, in one pass"""
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for word in words:
+            state = 0
+            for char in word:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] += (word,)
+        
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self.goto[state].items():
+                pending.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0) if state else 0
+                self.output[child] += self.output[self.fail[child]]
+        self.size = len(set(words))
+
+    def search(self, text):
+        """Set of the keywords found, stopping as soon as every keyword has been seen"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+                if len(found) == self.size:
+                    break
+        return found
+
+class KeywordSearch:
+    """Keywords present in a text, in keyword order. Small sets use one substring test per keyword,
+    which runs in C and stops at the first hit. Large sets use an Aho-Corasick automaton, whose cost
+    depends on the text rather than the keyword count"""
+    # Both costs grow linearly with the text, so the crossover is a keyword count; benchmark.py matcher
+    # puts it near 230 keywords for bodies from 200 bytes to 1 MB
+    LOOP_LIMIT = 256
+
+    def __init__(self, words):
+        self.words = list(dict.fromkeys(words))
+        self.automaton = AhoCorasick(self.words) if len(self.words) > self.LOOP_LIMIT else None
+
+    def find(self, text):
+        if self.automaton is None:
+            return [word for word in self.words if word in text]
+        found = self.automaton.search(text)
+        return [word for word in self.words if word in found]
+
+class KeywordMatcher:
+    """Keyword rules matched against paths and bodies, reporting overlapping keywords (cpanel and panel)"""
+    SCOPES = {'admin': 'body', 'backup': 'suffix', 'interesting': 'path'}
+
+    def __init__(self, rules):
+        self.categories = defaultdict(list)
+        for category, keyword in rules:
+            keyword = keyword.lower()
+            if keyword and category not in self.categories[keyword]:
+                self.categories[keyword].append(category)
+        self.path_search = KeywordSearch(kw for kw, categories in self.categories.items()
+                                         if any(self.SCOPES[category] != 'body' for category in categories))
+        self.body_search = KeywordSearch(kw for kw, categories in self.categories.items()
+                                         if any(self.SCOPES[category] == 'body' for category in categories))
+
+    def match(self, path, body=None):
+        """Map category to the keywords that hit: admin in the body, backup as a path suffix, interesting in the path"""
+        matches = {}
+        path = path.lower()
+        for keyword in self.path_search.find(path):
+            for category in self.categories[keyword]:
+                scope = self.SCOPES[category]
+                if scope == 'path' or (scope == 'suffix' and path.endswith(keyword)):
+                    self._add(matches, category, keyword)
+        if body:
+            for keyword in self.body_search.find(body.lower()):
+                for category in self.categories[keyword]:
+                    if self.SCOPES[category] == 'body':
+                        self._add(matches, category, keyword)
+        return matches
+
+    def _add(self, matches, category, keyword):
+        keywords = matches.setdefault(category, [])
+        if keyword not in keywords:
+            keywords.append(keyword)
+
+class TechProfile:
+    """Technology tags inferred for one target, used to prune and promote wordlist entries"""
+    PLATFORMS = {'php', 'asp', 'java', 'coldfusion'}
+    PATH_TAGS = re.compile(r'(?P<php>\.(?:php\d?|phtml)$)|(?P<asp>\.(?:aspx?|ashx|asmx|axd)$|(?:^|/)web\.config$)'
+                           r'|(?P<java>\.(?:jsp|jspx|do|action)$|(?:^|/)web-inf(?:/|$))|(?P<coldfusion>\.cfml?$)'
+                           r'|(?P<wordpress>(?:^|/)wp-)|(?P<joomla>(?:^|/)administrator(?:/|$))'
+                           r'|(?P<drupal>(?:^|/)(?:sites/default|user/login|node/add)(?:/|$))')
+    BODY_TAGS = re.compile(r'(?P<wordpress>wp-content/|wp-includes/)|(?P<joomla>/media/jui/|content="joomla)'
+                           r'|(?P<drupal>drupal\.settings|sites/default/files)|(?P<asp>__viewstate)')
+    HEADER_TAGS = [
+        ('x-powered-by', 'php', 'php'), ('x-powered-by', 'asp.net', 'asp'), ('x-powered-by', 'servlet', 'java'),
+        ('x-powered-by', 'jsp', 'java'), ('x-aspnet-version', '', 'asp'), ('x-generator', 'drupal', 'drupal'),
+        ('set-cookie', 'phpsessid', 'php'), ('set-cookie', 'laravel_session', 'php'), ('set-cookie', 'asp.net_sessionid', 'asp'),
+        ('set-cookie', 'jsessionid', 'java'), ('set-cookie', 'cfid', 'coldfusion'), ('set-cookie', 'wordpress_', 'wordpress'),
+        ('link', 'wp-json', 'wordpress'), ('server', 'php', 'php'), ('server', 'apache', 'apache'),
+        ('server', 'nginx', 'nginx'), ('server', 'iis', 'iis'),
+    ]
+
+    def __init__(self):
+        self.tags = set()
+        self.seen = DigestSet()
+        self.pruned = 0
+        self.promoted = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def detect(cls, headers, body=''):
+        """Tags evidenced by response headers and, for reachable pages, markers in the body"""
+        lowered = {name.lower(): value.lower() for name, value in headers.items()}
+        tags = {tag for name, needle, tag in cls.HEADER_TAGS if name in lowered and needle in lowered[name]}
+        if body:
+            tags.update(match.lastgroup for match in cls.BODY_TAGS.finditer(body[:65536].lower()))
+        return tags
+
+    @classmethod
+    def path_tags(cls, path):
+        """Tags a wordlist entry belongs to, from its extension or a well-known prefix"""
+        path = path.partition('?')[0].lower()
+        return {match.lastgroup for match in cls.PATH_TAGS.finditer(path)}
+
+    def add(self, tags):
+        """Merge tags, returning the ones not seen before"""
+        with self.lock:
+            new = set(tags) - self.tags
+            self.tags |= new
+        return new
+
+    @property
+    def excluded(self):
+        """Platforms ruled out once at least one platform has been evidenced"""
+        detected = self.tags & self.PLATFORMS
+        return self.PLATFORMS - detected if detected else set()
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by all workers, with AIMD back-off on throttling, timeouts and latency growth"""
+    def __init__(self, max_rate, min_rate=1.0, increase=1.0, decrease=0.5, latency_factor=3.0, cooldown=1.0):
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.burst = max(1.0, self.max_rate / 10)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.latency_floor = None
+        self.latency_ewma = None
+        self.backoffs = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token, returning how long the caller must wait before sending"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(delay, self.paused_until - now)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return max(delay, 0.0)
+
+    def _back_off(self, now, factor):
+        if now - self.last_decrease < self.cooldown:
+            return
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.last_decrease = now
+        self.backoffs += 1
+
+    def record_response(self, status, latency, retry_after=None):
+        """Feed back one response: back off on 429/503 or rising latency, otherwise ramp up"""
+        with self.lock:
+            now = time.monotonic()
+            if status in [429, 503]:
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + min(retry_after, 60))
+                self._back_off(now, self.decrease)
+                return
+            
+            self.latency_floor = latency if self.latency_floor is None else min(self.latency_floor, latency)
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            if self.latency_ewma > self.latency_factor * self.latency_floor + 0.05:
+                self._back_off(now, (1 + self.decrease) / 2)
+                return
+            
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def record_failure(self):
+        """Feed back a timeout or connection failure"""
+        with self.lock:
+            self._back_off(time.monotonic(), self.decrease)
+
+class ScanJournal:
+    """Append-only JSONL journal of completed paths, flushed in batches by a background thread"""
+    def __init__(self, path, batch_size=512, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+        self.file = None
+        self.writer = None
+
+    def open(self, header, resume=False):
+        """Open for appending when resuming, otherwise start a new journal with its header line"""
+        new = not resume or not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, 'w' if new else 'a', encoding='utf-8')
+        if new:
+            self.file.write(json.dumps(dict(header, journal=1)) + "\n")
+            self.file.flush()
+        self.writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self.writer.start()
+
+    def append(self, path, response_category, records):
+        line = json.dumps({'path': path, 'rt': response_category, 'records': records}, default=str)
+        with self.lock:
+            self.buffer.append(line)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.wake.set()
+
+    def _write_loop(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+        if lines and self.file:
+            self.file.write("\n".join(lines) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file is None:
+            return
+        self.closed = True
+        self.wake.set()
+        self.writer.join()
+        self.flush()
+        self.file.close()
+        self.file = None
+
+    def discard(self):
+        """Close and delete the journal once its scan has completed"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def replay(path):
+        """Yield (header, entries) from an existing journal, tolerating a torn last line"""
+        header = {}
+        entries = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if 'journal' in entry:
+                    header = entry
+                else:
+                    entries.append(entry)
+                    if len(entries) >= 10000:
+                        yield header, entries
+                        entries = []
+        yield header, entries
+
+class ResultSink:
+    """Destination for classified results, written by SinkWriter and read back for exports"""
+    def __init__(self, path):
+        self.path = path
+
+    def open(self):
+        pass
+
+    def write_batch(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def iter(self, category):
+        raise NotImplementedError
+
+class JsonlSink(ResultSink):
+    """One JSON object per line: {"category": ..., "item": {...}}"""
+    def open(self):
+        self.file = open(self.path, 'w', encoding='utf-8')
+
+    def write_batch(self, records):
+        self.file.write(''.join(json.dumps({'category': category, 'item': item}, default=str) + "\n"
+                                for category, item in records))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def iter(self, category):
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                record = json.loads(line)
+                if record['category'] == category:
+                    yield record['item']
+
+class CsvSink(ResultSink):
+    """Spreadsheet friendly columns plus the full item as JSON in the last column"""
+    columns = ['category', 'path', 'url', 'status', 'content_length', 'response_time', 'timestamp', 'data']
+
+    def open(self):
+        self.file = open(self.path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write_batch(self, records):
+        self.writer.writerows([category, item.get('path'), item.get('url'), item.get('status'),
+                               item.get('content_length'), item.get('response_time'), item.get('timestamp'),
+                               json.dumps(item, default=str)] for category, item in records)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def iter(self, category):
+        with open(self.path, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if row['category'] == category:
+                    yield json.loads(row['data'])
+
+class SqliteSink(ResultSink):
+    """SQLite table of (category, JSON item), indexed by category"""
+    def open(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("CREATE TABLE results (id INTEGER PRIMARY KEY, category TEXT NOT NULL, data TEXT NOT NULL)")
+        self.db.execute("CREATE INDEX results_category ON results (category)")
+
+    def write_batch(self, records):
+        with self.db:
+            self.db.executemany("INSERT INTO results (category, data) VALUES (?, ?)",
+                                ((category, json.dumps(item, default=str)) for category, item in records))
+
+    def close(self):
+        self.db.close()
+
+    def iter(self, category):
+        db = sqlite3.connect(self.path)
+        try:
+            for (data,) in db.execute("SELECT data FROM results WHERE category = ? ORDER BY id", (category,)):
+                yield json.loads(data)
+        finally:
+            db.close()
+
+def make_sink(path):
+    """Pick a sink implementation from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return CsvSink(path)
+    if extension in ['.db', '.sqlite', '.sqlite3']:
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+class SinkWriter:
+    """Background thread that drains classified results into a ResultSink in batches"""
+    def __init__(self, sink, batch_size=256):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._write_loop, name="sink-writer", daemon=True)
+        self.error = None
+
+    def start(self):
+        self.thread.start()
+
+    def put(self, category, item):
+        self.queue.put((category, item))
+
+    def _write_loop(self):
+        try:
+            self.sink.open()
+            done = False
+            while not done:
+                batch = [self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if batch:
+                    self.sink.write_batch(batch)
+        except Exception as e:
+            self.error = e
+        finally:
+            try:
+                self.sink.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Flush everything queued so far and stop the thread"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+def normalize_path(path):
+    """Canonical form of a URL path: single slashes, dot segments resolved, trailing slash kept"""
+    path, _, query = path.partition('?')
+    trailing = path.endswith('/')
+    path = posixpath.normpath('/' + path.lstrip('/'))
+    if trailing and path != '/':
+        path += '/'
+    return path + '?' + query if query else path
+
+class WorkQueue:
+    """Prioritised path sources drained by one worker pool: the wordlist plus directories found while scanning"""
+    def __init__(self, paths=None):
+        self.heap = [(0, 0, paths, 'path')] if paths is not None else []
+        self.order = itertools.count(1)
+        self.seen = DigestSet()
+        self.seen.add('/')
+        self.uncalibrated = deque()
+        self.waiting = {}
+        self.directories = 0
+        self.extra = 0
+        self.lock = threading.Lock()
+
+    def add(self, directory, priority, paths, calibrate=False):
+        """Queue the paths of a directory once per normalized directory; lower priority runs first"""
+        with self.lock:
+            if not self.seen.add(directory):
+                return False
+            self.directories += 1
+            if calibrate:
+                self.waiting[directory] = (priority, paths)
+                self.uncalibrated.append(directory)
+            else:
+                heapq.heappush(self.heap, (priority, next(self.order), paths, 'path'))
+        return True
+
+    def push(self, priority, paths, size=0, kind='path'):
+        """Queue a source of paths that needs no calibration, size only feeds the progress total;
+        kind names the task its paths become"""
+        with self.lock:
+            self.extra += size
+            heapq.heappush(self.heap, (priority, next(self.order), paths, kind))
+
+    def calibrated(self, directory):
+        """Release the paths of a directory once its soft-404 baseline exists"""
+        with self.lock:
+            priority, paths = self.waiting.pop(directory)
+            heapq.heappush(self.heap, (priority, next(self.order), paths, 'path'))
+
+    def next(self):
+        """Next task, ('calibrate', directory) or (kind, path), or None if nothing is runnable right now"""
+        with self.lock:
+            if self.uncalibrated:
+                return 'calibrate', self.uncalibrated.popleft()
+            while self.heap:
+                path = next(self.heap[0][2], None)
+                if path is not None:
+                    return self.heap[0][3], path
+                heapq.heappop(self.heap)
+            return None
+
+    @property
+    def idle(self):
+        """No queued paths and no directory waiting for calibration"""
+        return not self.heap and not self.uncalibrated and not self.waiting
+
+class PathStats:
+    """SQLite store of how often each path was a hit, per technology tag and status class, across scans"""
+    WEIGHTS = {'2xx': 1.0, '3xx': 0.5, '403': 0.5}
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("CREATE TABLE IF NOT EXISTS scans (tech TEXT PRIMARY KEY, scans INTEGER NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS hits (path TEXT NOT NULL, tech TEXT NOT NULL, status_class TEXT NOT NULL, "
+                           "hits INTEGER NOT NULL, PRIMARY KEY (path, tech, status_class))")
+        return connection
+
+    @staticmethod
+    def status_class(status):
+        if status == 403:
+            return '403'
+        if 200 <= status < 400:
+            return f"{status // 100}xx"
+        return None
+
+    def record_scan(self, tags, hits):
+        """Count one finished scan under every tag ('' is all scans) and each (path, status) hit once"""
+        keys = [''] + sorted(tags)
+        classes = {(normalize_path(path), self.status_class(status)) for path, status in hits}
+        rows = [(path, tech, status_class) for path, status_class in classes if status_class for tech in keys]
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany("INSERT INTO scans VALUES (?, 1) ON CONFLICT(tech) DO UPDATE SET scans = scans + 1",
+                                       [(tech,) for tech in keys])
+                connection.executemany("INSERT INTO hits VALUES (?, ?, ?, 1) "
+                                       "ON CONFLICT(path, tech, status_class) DO UPDATE SET hits = hits + 1", rows)
+        finally:
+            connection.close()
+        return len(rows)
+
+    def probabilities(self, tags):
+        """Smoothed hit probability per normalized path, the best of the global rate and each tag's rate"""
+        keys = [''] + sorted(tags)
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                f"SELECT h.path, h.tech, h.status_class, h.hits, s.scans FROM hits h JOIN scans s ON s.tech = h.tech "
+                f"WHERE h.tech IN ({', '.join('?' * len(keys))})", keys).fetchall()
+        finally:
+            connection.close()
+        
+        scores = defaultdict(float)
+        for path, tech, status_class, hits, scans in rows:
+            scores[(path, tech)] += self.WEIGHTS.get(status_class, 0) * hits / (scans + 1)
+        probabilities = {}
+        for (path, tech), score in scores.items():
+            probabilities[path] = max(probabilities.get(path, 0.0), min(score, 1.0))
+        return probabilities
+
+def default_stats_path():
+    """Location of the learned path statistics shared by every scan of this user"""
+    return os.path.join(wordlist_cache_dir(), 'path_stats.db')
+
+class ScanBaseline:
+    """Hits of a previous scan of one target, read from its JSON results, to revalidate and diff against"""
+    CATEGORIES = ['found', 'redirects', 'admin_panels', 'interesting', 'backup_files']
+    VALIDATORS = [('ETag', 'If-None-Match'), ('Last-Modified', 'If-Modified-Since')]
+
+    def __init__(self, base_url, files):
+        self.files = list(files)
+        self.records = defaultdict(list)
+        origin = urlparse(base_url)[:2]
+        for file in self.files:
+            with open(file, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            for category in self.CATEGORIES:
+                for item in results.get(category, []):
+                    if urlparse(item.get('url', ''))[:2] == origin:
+                        self.records[normalize_path(item['path'])].append((category, item))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, path):
+        return path in self.records
+
+    def request_headers(self, path):
+        """Conditional request headers built from the validators the baseline response carried"""
+        headers = {}
+        for category, item in self.records[path]:
+            lowered = {name.lower(): value for name, value in item.get('headers', {}).items()}
+            for validator, condition in self.VALIDATORS:
+                if validator.lower() in lowered:
+                    headers[condition] = lowered[validator.lower()]
+        return headers
+
+    def unchanged(self, path, status, headers):
+        """True if a cheap revalidation response matches the baseline: 304, or the same status with no
+        differing Content-Length or ETag"""
+        if status == 304:
+            return True
+        if status != self.records[path][0][1]['status']:
+            return False
+        before = {}
+        for category, item in self.records[path]:
+            before.update({name.lower(): value for name, value in item.get('headers', {}).items()})
+        return all(headers.get(name) is None or before.get(name.lower()) in [None, headers[name]]
+                   for name in ['Content-Length', 'ETag'])
+
+    @staticmethod
+    def snapshot(records):
+        category, item = records[0]
+        return {'status': item['status'], 'content_length': item['content_length'],
+                'categories': sorted({category for category, _ in records})}
+
+    def diff(self, current, revalidated):
+        """New, removed and changed paths of the current records against the baseline"""
+        diff = {'new': [], 'removed': [], 'changed': []}
+        for path in sorted(current.keys() - self.records.keys()):
+            diff['new'].append(dict(path=path, **self.snapshot(current[path])))
+        for path in sorted(self.records):
+            before = self.snapshot(self.records[path])
+            if path not in current:
+                if path in revalidated:
+                    diff['removed'].append(dict(path=path, **before))
+                continue
+            after = self.snapshot(current[path])
+            if after != before:
+                diff['changed'].append({'path': path, 'before': before, 'after': after})
+        return diff
+
+class TimedLive(Live):
+    """rich Live that pulls its renderable on every tick of its own refresh thread and times each refresh,
+    so scan loops only bump counters and the UI cost can be reported"""
+    def __init__(self, render, console, refresh_per_second=2):
+        super().__init__(console=console, refresh_per_second=refresh_per_second, get_renderable=render)
+        self.frames = 0
+        self.seconds = 0.0
+
+    def refresh(self):
+        start = time.perf_counter()
+        try:
+            super().refresh()
+        finally:
+            self.frames += 1
+            self.seconds += time.perf_counter() - start
+
+class ConnectionStats:
+    """Thread-safe counters for connections opened, reused and discarded"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def add(self, counter, amount=1):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+class CountingPoolMixin:
+    """Connection pool hooks that feed ConnectionStats"""
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        if self.stats is not None:
+            self.stats.add('reused' if conn.is_connected else 'opened')
+        return conn
+
+    def _put_conn(self, conn):
+        if self.stats is not None and conn is not None and self.pool is not None and self.pool.full():
+            self.stats.add('discarded')
+        super()._put_conn(conn)
+
+REQUEST_PHASES = threading.local()
+
+class TimedConnectionMixin:
+    """Resolve and connect in separate steps so the request on this thread gets dns and connect timings"""
+    def _new_conn(self):
+        timings = getattr(REQUEST_PHASES, 'timings', None)
+        if timings is None:
+            return super()._new_conn()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)))
+        except OSError:
+            addresses = [host]  # let urllib3 resolve again and raise its own error
+        resolved = time.perf_counter()
+        timings['dns'] = timings.get('dns', 0.0) + resolved - start
+        try:
+            for address in addresses[:-1]:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError:
+                    continue
+            self._dns_host = addresses[-1]
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+            timings['connect'] = timings.get('connect', 0.0) + time.perf_counter() - resolved
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        """Connect and handshake, booking the time not spent resolving or connecting as tls"""
+        timings = getattr(REQUEST_PHASES, 'timings', None)
+        if timings is None:
+            return super().connect()
+        network = lambda: timings.get('dns', 0.0) + timings.get('connect', 0.0)
+        before = network()
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            timings['tls'] = timings.get('tls', 0.0) + max(0.0, time.perf_counter() - start - (network() - before))
+
+class CountingHTTPConnectionPool(CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class CountingHTTPSConnectionPool(CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class CountingPoolManager(PoolManager):
+    """PoolManager whose host pools report into a shared ConnectionStats"""
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self.stats
+        return pool
+
+class TunedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with a pool sized for the worker count and connection counters"""
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = CountingPoolManager(num_pools=connections, maxsize=maxsize, block=block,
+                                               stats=self.stats, **pool_kwargs)
+
+class LogLinearHistogram:
+    """Sparse latency histogram of log2 ranges each split into SUB_BUCKETS linear buckets, so quantiles
+    stay within a few percent at any scale and histograms merge by adding counts"""
+    SUB_BUCKETS = 16
+    UNIT = 1e-6
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.sum = 0.0
+
+    @classmethod
+    def slot(cls, units):
+        """Bucket index of a whole number of microseconds"""
+        if units < cls.SUB_BUCKETS:
+            return units
+        shift = units.bit_length() - cls.SUB_BUCKETS.bit_length()
+        return shift * cls.SUB_BUCKETS + (units >> shift)
+
+    @classmethod
+    def bounds(cls, index):
+        """(lower, upper) seconds covered by a bucket"""
+        if index < cls.SUB_BUCKETS:
+            return index * cls.UNIT, (index + 1) * cls.UNIT
+        shift, mantissa = divmod(index, cls.SUB_BUCKETS)
+        mantissa += cls.SUB_BUCKETS
+        return (mantissa << shift - 1) * cls.UNIT, (mantissa + 1 << shift - 1) * cls.UNIT
+
+    def record(self, seconds):
+        self.counts[self.slot(max(0, int(seconds / self.UNIT)))] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q):
+        """Midpoint of the bucket holding the q-th observation"""
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower, upper = self.bounds(index)
+                return (lower + upper) / 2
+        return 0.0
+
+    def cumulative(self, limits):
+        """Observations below each limit in seconds; exact when limits are bucket boundaries"""
+        slots = sorted(self.counts)
+        totals = []
+        seen = 0
+        position = 0
+        for limit in limits:
+            edge = self.slot(round(limit / self.UNIT))
+            while position < len(slots) and slots[position] < edge:
+                seen += self.counts[slots[position]]
+                position += 1
+            totals.append(seen)
+        return totals
+
+    def to_dict(self):
+        return {'count': self.count, 'sum': round(self.sum, 6),
+                'p50': round(self.quantile(0.5), 6), 'p90': round(self.quantile(0.9), 6), 'p99': round(self.quantile(0.99), 6),
+                'buckets': {str(index): count for index, count in sorted(self.counts.items())}}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts.update({int(index): count for index, count in data['buckets'].items()})
+        histogram.count = data['count']
+        histogram.sum = data['sum']
+        return histogram
+
+class RequestMetrics:
+    """Per-phase request timings keyed by (phase, host, status): dns, connect and tls are the network,
+    ttfb and body the target, throttle and classify the scanner itself"""
+    PHASES = ['dns', 'connect', 'tls', 'ttfb', 'body', 'throttle', 'classify']
+    # Prometheus buckets are powers of two microseconds, which are boundaries of LogLinearHistogram
+    PROMETHEUS_BUCKETS = [(1 << shift) * LogLinearHistogram.UNIT for shift in range(4, 27)]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = defaultdict(LogLinearHistogram)
+
+    def observe(self, host, status, timings):
+        with self.lock:
+            for phase, seconds in timings.items():
+                self.histograms[(phase, host, str(status))].record(seconds)
+
+    def merge(self, other):
+        with other.lock:
+            items = [(key, histogram.counts.copy(), histogram.count, histogram.sum) for key, histogram in other.histograms.items()]
+        with self.lock:
+            for key, counts, count, total in items:
+                histogram = self.histograms[key]
+                histogram.counts.update(counts)
+                histogram.count += count
+                histogram.sum += total
+
+    @classmethod
+    def combined(cls, sources):
+        metrics = cls()
+        for source in sources:
+            metrics.merge(source)
+        return metrics
+
+    def by_phase(self):
+        """One histogram per phase across hosts and statuses, in PHASES order"""
+        phases = defaultdict(LogLinearHistogram)
+        with self.lock:
+            for (phase, host, status), histogram in self.histograms.items():
+                phases[phase].merge(histogram)
+        return [(phase, phases[phase]) for phase in self.PHASES if phase in phases]
+
+    def snapshot(self):
+        """JSON-ready copy; bucket counts of snapshots can be added together to merge them"""
+        with self.lock:
+            series = [dict(phase=phase, host=host, status=status, **histogram.to_dict())
+                      for (phase, host, status), histogram in sorted(self.histograms.items())]
+        return {'generated': datetime.now().isoformat(), 'unit': 'seconds',
+                'sub_buckets': LogLinearHistogram.SUB_BUCKETS, 'series': series}
+
+    def prometheus(self):
+        """Prometheus text exposition of every series as one histogram metric"""
+        name = 'haider_request_phase_seconds'
+        lines = [f"# HELP {name} Time spent in each phase of a request.", f"# TYPE {name} histogram"]
+        escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        with self.lock:
+            for (phase, host, status), histogram in sorted(self.histograms.items()):
+                labels = f'phase="{phase}",host="{escape(host)}",status="{status}"'
+                for limit, count in zip(self.PROMETHEUS_BUCKETS, histogram.cumulative(self.PROMETHEUS_BUCKETS)):
+                    lines.append(f'{name}_bucket{{{labels},le="{limit:.6g}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """Publish request phase metrics while a scan runs: Prometheus text on a localhost port and/or
+    a JSON snapshot file rewritten every interval"""
+    def __init__(self, collect, port=None, path=None, interval=10):
+        self.collect = collect
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._write_loop, name="metrics-writer", daemon=True)
+        self.error = None
+
+    def start(self):
+        if self.port is not None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+            collect = self.collect
+            
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] not in ['/', '/metrics']:
+                        self.send_error(404)
+                        return
+                    body = collect().prometheus().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, format, *args):
+                    pass
+            
+            self.server = ThreadingHTTPServer(('127.0.0.1', self.port), MetricsHandler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True).start()
+        if self.path:
+            self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/metrics" if self.server else None
+
+    def write(self):
+        """Replace the snapshot file atomically so readers never see a partial write"""
+        try:
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(self.collect().snapshot(), file)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self.error = e
+
+    def _write_loop(self):
+        while not self.stopping.wait(self.interval):
+            self.write()
+
+    def close(self):
+        """Write the final snapshot and stop serving"""
+        self.stopping.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.path:
+            self.write()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+def start_metrics(console, collect, port=None, path=None, interval=10):
+    """Start a MetricsExporter when a port or snapshot file is configured, None otherwise"""
+    if port is None and not path:
+        return None
+    exporter = MetricsExporter(collect, port, path, interval)
+    try:
+        exporter.start()
+    except OSError as e:
+        console.print(f"[yellow]! Metrics endpoint unavailable on port {port}: {e}[/yellow]")
+        exporter.server = None
+        exporter.port = None
+        if not path:
+            return None
+        exporter.start()
+    if exporter.url:
+        console.print(f"[cyan]Metrics: {exporter.url}[/cyan]")
+    if path:
+        console.print(f"[cyan]Metrics snapshots: {path} every {interval:g}s[/cyan]")
+    return exporter
+
+def phase_table(metrics):
+    """Latency percentiles of each request phase, None before any request was timed"""
+    phases = metrics.by_phase()
+    if not phases:
+        return None
+    table = Table(title="⏲ Request Phases", show_header=True, header_style="bold cyan", border_style="cyan")
+    table.add_column("Phase", style="cyan", width=10)
+    for column in ["Count", "p50", "p90", "p99", "Total"]:
+        table.add_column(column, style="magenta", justify="right")
+    for phase, histogram in phases:
+        table.add_row(phase, str(histogram.count),
+                      *[f"{histogram.quantile(q) * 1000:.2f} ms" for q in [0.5, 0.9, 0.99]], f"{histogram.sum:.2f} s")
+    return table
+
+class HtmlReport:
+    """HTML report streamed to a file: each section's rows are embedded as a JSON array written one result
+    at a time, and the page renders them client-side with filtering, sorting and pagination"""
+    CARDS = {'found': "✓ Found Paths", 'admin_panels': "★ Admin Panels", 'redirects': "→ Redirects", 'errors': "✗ Errors"}
+    # (category, title, [(column label, result key, kind)]); kind picks how the page renders the cell
+    SECTIONS = [
+        ('found', "📁 Found Paths & Directories", [("Path / URL", 'path', 'link'), ("Status", 'status', 'status'),
+                                                  ("Response Time", 'response_time', 'seconds'),
+                                                  ("Content Length", 'content_length', 'bytes')]),
+        ('admin_panels', "★ Admin Panels Detected", [("Path / URL", 'path', 'link'), ("Keywords Found", 'keywords_found', 'text'),
+                                                     ("Status", 'status', 'status')]),
+        ('redirects', "→ Redirects", [("Original Path", 'path', 'link'), ("Redirects To", 'redirect_to', 'url'),
+                                      ("Status", 'status', 'status')]),
+        ('interesting', "⚠ Interesting", [("Path / URL", 'path', 'link'), ("Status", 'status', 'status'),
+                                          ("Content Length", 'content_length', 'bytes')]),
+        ('backup_files', "B Backup Files", [("Path / URL", 'path', 'link'), ("Status", 'status', 'status'),
+                                            ("Content Length", 'content_length', 'bytes')]),
+        ('errors', "✗ Errors", [("Path", 'path', 'text'), ("Error", 'error', 'text')]),
+    ]
+    STYLE = """
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; padding: 20px; }
+.container { max-width: 1400px; margin: 0 auto; }
+.header { background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%); color: white; padding: 40px; border-radius: 10px; box-shadow: 0 10px 30px rgba(0,0,0,0.3); margin-bottom: 30px; text-align: center; }
+.header h1 { font-size: 2.5em; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }
+.header p { font-size: 1.1em; opacity: 0.9; margin: 5px 0; }
+.summary { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }
+.card { background: white; padding: 25px; border-radius: 10px; box-shadow: 0 5px 15px rgba(0,0,0,0.1); text-align: center; }
+.card h3 { color: #2c3e50; margin-bottom: 10px; font-size: 1.1em; }
+.card .number { font-size: 2.5em; font-weight: bold; color: #667eea; }
+.section { background: white; padding: 30px; border-radius: 10px; box-shadow: 0 5px 15px rgba(0,0,0,0.1); margin-bottom: 30px; }
+.section h2 { color: #2c3e50; margin-bottom: 20px; padding-bottom: 10px; border-bottom: 3px solid #667eea; font-size: 1.8em; }
+.controls { display: flex; flex-wrap: wrap; gap: 10px; align-items: center; }
+.controls input, .controls select { padding: 8px 12px; border: 1px solid #ccc; border-radius: 5px; font-size: 1em; }
+.controls input { flex: 1; min-width: 200px; }
+table { width: 100%; border-collapse: collapse; margin-top: 15px; }
+th { background: linear-gradient(135deg, #34495e 0%, #2c3e50 100%); color: white; padding: 15px; text-align: left; font-weight: 600; cursor: pointer; user-select: none; }
+th.asc::after { content: " ▲"; }
+th.desc::after { content: " ▼"; }
+td { padding: 12px 15px; border-bottom: 1px solid #ecf0f1; word-break: break-word; }
+tr:hover { background-color: #f8f9fa; }
+a { color: #3498db; text-decoration: none; font-weight: 600; }
+a:hover { color: #764ba2; text-decoration: underline; }
+.status-badge { display: inline-block; padding: 5px 12px; border-radius: 20px; font-weight: 600; font-size: 0.9em; background-color: #e2e3e5; color: #383d41; }
+.status-2 { background-color: #d4edda; color: #155724; }
+.status-3 { background-color: #fff3cd; color: #856404; }
+.status-4, .status-5 { background-color: #f8d7da; color: #721c24; }
+.copy-btn, .pager button { background-color: #667eea; color: white; border: none; padding: 6px 10px; border-radius: 5px; cursor: pointer; font-size: 0.9em; }
+.copy-btn:hover, .pager button:hover { background-color: #764ba2; }
+.pager button:disabled { background-color: #bdc3c7; cursor: default; }
+.pager { display: flex; gap: 10px; align-items: center; justify-content: flex-end; margin-top: 15px; color: #7f8c8d; }
+.footer { text-align: center; color: white; margin-top: 40px; padding: 20px; font-size: 0.95em; }
+.empty-state { text-align: center; padding: 40px; color: #7f8c8d; font-size: 1.1em; }
+@media print { body { background: white; } .copy-btn, .controls, .pager { display: none; } }
+"""
+    SCRIPT = """
+const PAGE_SIZE = 100;
+
+function safeHref(url) {
+    return /^https?:\\/\\//i.test(url) ? url : null;
+}
+
+function formatCell(kind, value, href) {
+    if (kind === 'link' || kind === 'url') {
+        const target = safeHref(kind === 'url' ? value : href);
+        const node = document.createElement(target ? 'a' : 'span');
+        node.textContent = value;
+        if (target) {
+            node.href = target;
+            node.target = '_blank';
+            node.rel = 'noopener noreferrer';
+        }
+        return node;
+    }
+    if (kind === 'status') {
+        const badge = document.createElement('span');
+        badge.className = 'status-badge status-' + String(value).charAt(0);
+        badge.textContent = value;
+        return badge;
+    }
+    if (kind === 'seconds') return document.createTextNode(Number(value).toFixed(2) + 's');
+    if (kind === 'bytes') return document.createTextNode(value + ' bytes');
+    return document.createTextNode(value == null ? '' : String(value));
+}
+
+function setupSection(section) {
+    const category = section.dataset.category;
+    const columns = JSON.parse(section.dataset.columns);
+    const rows = JSON.parse(document.getElementById('data-' + category).textContent);
+    if (!rows.length) {
+        section.querySelector('.body').innerHTML = '<div class="empty-state">Nothing found during scan</div>';
+        return;
+    }
+
+    const search = section.querySelector('input');
+    const statusFilter = section.querySelector('select');
+    const statusColumn = columns.findIndex(column => column[1] === 'status');
+    if (statusColumn < 0) {
+        statusFilter.remove();
+    } else {
+        [...new Set(rows.map(row => row[statusColumn + 1]))].sort().forEach(status => {
+            statusFilter.add(new Option(status, status));
+        });
+    }
+
+    const thead = section.querySelector('thead tr');
+    const tbody = section.querySelector('tbody');
+    const info = section.querySelector('.pager span');
+    const [previous, next] = section.querySelectorAll('.pager button');
+    const state = {sort: -1, descending: false, page: 0, view: rows};
+
+    columns.forEach(([label], index) => {
+        const th = document.createElement('th');
+        th.textContent = label;
+        th.addEventListener('click', () => {
+            state.descending = state.sort === index ? !state.descending : false;
+            state.sort = index;
+            thead.querySelectorAll('th').forEach(cell => cell.className = '');
+            th.className = state.descending ? 'desc' : 'asc';
+            update();
+        });
+        thead.appendChild(th);
+    });
+    thead.appendChild(document.createElement('th'));
+
+    function update() {
+        const needle = search.value.trim().toLowerCase();
+        const status = statusFilter.value;
+        let view = rows;
+        if (needle) view = view.filter(row => row.some(value => String(value).toLowerCase().includes(needle)));
+        if (status && statusColumn >= 0) view = view.filter(row => String(row[statusColumn + 1]) === status);
+        if (state.sort >= 0) {
+            const key = state.sort + 1;
+            const direction = state.descending ? -1 : 1;
+            view = view.slice().sort((a, b) => (a[key] < b[key] ? -1 : a[key] > b[key] ? 1 : 0) * direction);
+        }
+        state.view = view;
+        state.page = 0;
+        render();
+    }
+
+    function render() {
+        const pages = Math.max(1, Math.ceil(state.view.length / PAGE_SIZE));
+        state.page = Math.min(state.page, pages - 1);
+        const fragment = document.createDocumentFragment();
+        for (const row of state.view.slice(state.page * PAGE_SIZE, (state.page + 1) * PAGE_SIZE)) {
+            const tr = document.createElement('tr');
+            columns.forEach(([label, kind], index) => {
+                const td = document.createElement('td');
+                td.appendChild(formatCell(kind, row[index + 1], row[0]));
+                tr.appendChild(td);
+            });
+            const action = document.createElement('td');
+            if (row[0]) {
+                const copy = document.createElement('button');
+                copy.className = 'copy-btn';
+                copy.textContent = '📋';
+                copy.addEventListener('click', () => copyToClipboard(row[0]));
+                action.appendChild(copy);
+            }
+            tr.appendChild(action);
+            fragment.appendChild(tr);
+        }
+        tbody.replaceChildren(fragment);
+        info.textContent = `Page ${state.page + 1} of ${pages} · ${state.view.length} of ${rows.length} rows`;
+        previous.disabled = state.page === 0;
+        next.disabled = state.page >= pages - 1;
+    }
+
+    let typing;
+    search.addEventListener('input', () => {
+        clearTimeout(typing);
+        typing = setTimeout(update, 150);
+    });
+    statusFilter.addEventListener('change', update);
+    previous.addEventListener('click', () => { state.page--; render(); });
+    next.addEventListener('click', () => { state.page++; render(); });
+    render();
+}
+
+function copyToClipboard(text) {
+    navigator.clipboard.writeText(text).then(() => {
+        alert('URL copied to clipboard: ' + text);
+    }).catch(() => {
+        alert('Failed to copy URL');
+    });
+}
+
+document.querySelectorAll('.section[data-category]').forEach(setupSection);
+"""
+
+    def __init__(self, file):
+        self.file = file
+
+    @staticmethod
+    def embed(value):
+        """JSON that cannot close the <script> element it is embedded in"""
+        return (json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+                .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+
+    def start(self, base_url, counts):
+        cards = ''.join(f'<div class="card"><h3>{label}</h3><div class="number">{counts[category]}</div></div>'
+                        for category, label in self.CARDS.items())
+        self.file.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Haider Tools - Scan Report</title>
+<style>{self.STYLE}</style>
+</head>
+<body>
+<div class="container">
+<div class="header">
+<h1>🔍 Haider Tools - Scan Report</h1>
+<p><strong>Target:</strong> {html.escape(base_url)}</p>
+<p><strong>Scan Date:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+<p><strong>Report ID:</strong> {datetime.now().strftime("%Y%m%d_%H%M%S")}</p>
+</div>
+<div class="summary">{cards}</div>
+""")
+
+    def section(self, category, title, columns, items):
+        """One section: the table skeleton, then its rows as [url, cell, ...] arrays"""
+        spec = html.escape(json.dumps([[label, kind] for label, key, kind in columns]))
+        self.file.write(f"""<div class="section" data-category="{category}" data-columns="{spec}">
+<h2>{title}</h2>
+<div class="body">
+<div class="controls"><input type="search" placeholder="Filter..."><select><option value="">All statuses</option></select></div>
+<table><thead><tr></tr></thead><tbody></tbody></table>
+<div class="pager"><span></span><button type="button">‹ Prev</button><button type="button">Next ›</button></div>
+</div>
+</div>
+<script type="application/json" id="data-{category}">[""")
+        separator = "\n"
+        for item in items:
+            row = [item.get('url', '')]
+            for label, key, kind in columns:
+                value = item.get(key, '')
+                row.append(', '.join(value) if isinstance(value, list) else value)
+            self.file.write(separator + self.embed(row))
+            separator = ",\n"
+        self.file.write("\n]</script>\n")
+
+    def finish(self):
+        self.file.write(f"""<div class="footer">
+<p>Generated by Haider Tools | Advanced Web Scanner</p>
+<p>All links are clickable and can be opened directly in your browser</p>
+</div>
+</div>
+<script>{self.SCRIPT}</script>
+</body>
+</html>
+""")
 
 class AdvancedScanner:
     def __init__(self, base_url, wordlist_path, threads=10, user_agent="Mozilla/5.0", 
                  timeout=5, auto_browse=False, browse_delay=2, verify_ssl=True, 
-                 follow_redirects=True, rate_limit=0, proxy=None):
+                 follow_redirects=True, rate_limit=0, proxy=None, engine='thread', max_rps=0, throttle_retries=3,
+                 pool_size=None, pool_block=False, keep_alive=True, retries=0, retry_backoff=0.0,
+                 dedup='exact', bloom_error_rate=0.001, submit_window=4,
+                 soft_404=True, calibration_probes=3, probe_mode='get', drain_limit=8192,
+                 max_body_bytes=1048576, journal_path=None, sink=None, live_window=100, max_depth=0, rules=None,
+                 wordlist_cache=True, wordlist_cache_dir=None, mutator=None, tech_mode='prune',
+                 stop_after=0, order=None, stats_path=None, baseline=None, sample=1.0, sample_slice=None,
+                 refresh_per_second=2, live=True, interactive=True, metrics_port=None, metrics_file=None,
+                 metrics_interval=10):
         self.base_url = base_url.rstrip('/')
         self.wordlist_path = wordlist_path
         self.threads = threads
@@ -38,7 +1691,65 @@ class AdvancedScanner:
         self.verify_ssl = verify_ssl
         self.follow_redirects = follow_redirects
         self.rate_limit = rate_limit
+        self.max_rps = max_rps or (threads / rate_limit if rate_limit > 0 else 0)
+        self.rate_limiter = AdaptiveRateLimiter(self.max_rps) if self.max_rps > 0 else None
+        self.throttle_retries = throttle_retries
         self.proxy = {'http': proxy, 'https': proxy} if proxy else None
+        self.engine = engine
+        self.pool_size = pool_size or threads
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.dedup = dedup
+        self.bloom_error_rate = bloom_error_rate
+        self.submit_window = submit_window
+        self.soft_404 = soft_404
+        self.calibration_probes = calibration_probes
+        self.baselines = {}
+        self.soft_404_filtered = 0
+        self.probe_mode = probe_mode
+        self.drain_limit = drain_limit
+        self.head_supported = True
+        self.max_body_bytes = max_body_bytes
+        self.truncated_bodies = 0
+        self.journal_path = journal_path
+        self.journal = None
+        self.completed_paths = DigestSet()
+        self.resumed_paths = 0
+        self.local = threading.local()
+        self.bytes_received = 0
+        self.bytes_saved = 0
+        self.wordlist_stats = {'unique': 0, 'duplicates': 0}
+        self.wordlist_cache = wordlist_cache
+        self.wordlist_cache_dir = wordlist_cache_dir
+        self.compiled_wordlist = None
+        self.mutator = mutator
+        self.tech_mode = tech_mode
+        self.tech = TechProfile()
+        self.stop_after = stop_after
+        self.path_stats = PathStats(stats_path) if stats_path else None
+        self.learned = {}
+        self.learned_promoted = 0
+        self.order = order or ('prior' if stop_after else None)
+        self.baseline = ScanBaseline(base_url, baseline) if baseline else None
+        self.revalidated = DigestSet()
+        self.revalidation_stats = Counter()
+        self.diff = None
+        self.sample = sample
+        self.sample_buckets = max(1, round(1 / sample))
+        self.sample_slice = (sample_slice if sample_slice is not None else datetime.now().toordinal() // 7) % self.sample_buckets
+        self.stop_event = threading.Event()
+        self.total_paths = 0
+        self.mutation_stats = {'paths': 0, 'duplicates': 0}
+        self.max_depth = max_depth
+        self.work = None
+        self.queued_paths = None
+        self.resumed_hits = []
+        self.check_backups = False
+        self.backup_paths = None
+        self.backup_candidates = 0
+        self.archive_extensions = ['.zip', '.tar.gz', '.tar', '.gz', '.rar', '.sql']
         self.console = Console()
         
         self.results = {
@@ -58,14 +1769,26 @@ class AdvancedScanner:
         self.live_table.add_column("Time", justify="right", width=8)
         self.live_table.add_column("Type", style="yellow", width=12)
         
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': self.user_agent})
-        if self.proxy:
-            self.session.proxies.update(self.proxy)
+        self.connection_stats = ConnectionStats()
+        self.session = self.build_session()
+        self.metrics = RequestMetrics()
+        self.metrics_host = urlparse(self.base_url).netloc or self.base_url
+        self.metrics_port = metrics_port
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
         
         self.scan_start_time = None
         self.total_requests = 0
-        self.live_results = []
+        self.stats_lock = threading.Lock()
+        self.live_results = deque(maxlen=live_window)
+        self.refresh_per_second = refresh_per_second
+        self.live_enabled = live
+        self.interactive = interactive
+        self.live = None
+        self.scanned = 0
+        self.counts = Counter()
+        self.sink = make_sink(sink) if isinstance(sink, str) else sink
+        self.sink_writer = None
         
 
         self.admin_keywords = ['admin', 'login', 'dashboard', 'panel', 'management', 
@@ -74,24 +1797,431 @@ class AdvancedScanner:
                                '.gz', '.rar', '~', '.swp', '.swo']
         self.interesting_keywords = ['config', 'secret', 'key', 'password', 'token', 
                                      'credential', 'api_key', 'private']
+        self.rules = list(rules or [])
+        self.matcher = self.build_matcher()
 
-    def load_wordlist(self):
-        """Load and validate wordlist with duplicate detection"""
+    def build_matcher(self):
+        """Compile the built-in keyword lists and any user rules into one matcher"""
+        rules = [('admin', kw) for kw in self.admin_keywords]
+        rules += [('backup', kw) for kw in self.backup_keywords]
+        rules += [('interesting', kw) for kw in self.interesting_keywords]
+        admin_words = [kw.lower() for category, kw in rules + self.rules if category == 'admin']
+        self.admin_path_pattern = re.compile(trie_pattern(admin_words))
+        return KeywordMatcher(rules + self.rules)
+
+    def build_session(self):
+        """Create the shared session with a pool sized for the worker count"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': self.user_agent})
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        if self.proxy:
+            session.proxies.update(self.proxy)
+        
+        retry = Retry(total=self.retries, read=False, backoff_factor=self.retry_backoff,
+                      status_forcelist=[502, 503, 504] if self.retries else None,
+                      allowed_methods=['HEAD', 'GET'], raise_on_status=False, respect_retry_after_header=True)
+        adapter = TunedHTTPAdapter(self.connection_stats, pool_connections=10, pool_maxsize=self.pool_size,
+                                   pool_block=self.pool_block, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def build_trace_config(self):
+        """aiohttp trace hooks feeding the same connection counters as the thread engine"""
+        trace_config = aiohttp.TraceConfig()
+        
+        def timings(context):
+            return context.trace_request_ctx if isinstance(context.trace_request_ctx, dict) else {}
+        
+        async def on_dns_start(session, context, params):
+            context.dns_start = time.perf_counter()
+        
+        async def on_dns_end(session, context, params):
+            phases = timings(context)
+            phases['dns'] = phases.get('dns', 0.0) + time.perf_counter() - context.dns_start
+        
+        async def on_create_start(session, context, params):
+            context.connect_start = time.perf_counter()
+            context.dns_before = timings(context).get('dns', 0.0)
+        
+        async def on_create(session, context, params):
+            self.connection_stats.add('opened')
+            # aiohttp resolves and handshakes inside connection creation, so tls is part of connect here
+            phases = timings(context)
+            resolving = phases.get('dns', 0.0) - context.dns_before
+            phases['connect'] = phases.get('connect', 0.0) + time.perf_counter() - context.connect_start - resolving
+        
+        async def on_reuse(session, context, params):
+            self.connection_stats.add('reused')
+        
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_create_start)
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    @property
+    def async_proxy(self):
+        """Proxy URL in the form aiohttp expects"""
+        return self.proxy['http'] if self.proxy else None
+
+    def make_dedup_filter(self, size=None):
+        """Create the structure used to drop duplicate wordlist entries"""
+        if self.dedup == 'bloom':
+            return BloomFilter(max(size or self.count_wordlist_lines(), 1000), self.bloom_error_rate)
+        return DigestSet()
+
+    def open_wordlist(self):
+        """Memory-mapped compiled wordlist, or None when caching is off or unavailable"""
+        if self.compiled_wordlist is None and self.wordlist_cache:
+            try:
+                self.compiled_wordlist = open_compiled_wordlist(self.wordlist_path, self.wordlist_cache_dir)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                self.console.print(f"[yellow]! Wordlist cache unavailable ({e}), reading the text wordlist[/yellow]")
+                self.wordlist_cache = False
+        return self.compiled_wordlist
+
+    def estimate_wordlist_size(self):
+        """Paths the wordlist will produce, mutations included, used as the progress total"""
+        lines = self.count_wordlist_lines() // self.sample_buckets
+        if not self.mutator:
+            return lines
+        return int(lines * self.mutator.factor(itertools.islice(self.read_wordlist(False), 1000)))
+
+    def count_wordlist_lines(self):
+        """Count wordlist lines without decoding them"""
+        compiled = self.open_wordlist()
+        if compiled is not None:
+            return len(compiled)
+        lines = 0
         try:
-            with open(self.wordlist_path, 'r', encoding='utf-8') as file:
-                words = [line.strip() for line in file if line.strip() and not line.strip().startswith('#')]
-            
-            original_count = len(words)
-            words = list(set(words))   
-            
-            self.console.print(f"[cyan]✓ Loaded {len(words)} unique paths (removed {original_count - len(words)} duplicates)[/cyan]")
-            return words
+            with open(self.wordlist_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    lines += chunk.count(b'\n')
+        except OSError:
+            return 0
+        return lines
+
+    def load_wordlist(self, track_stats=True):
+        """Stream wordlist paths, expanded by the mutator when one is configured and cut to the sampled slice"""
+        if not self.mutator:
+            paths = self.read_wordlist(track_stats)
+        else:
+            stats = {'paths': 0, 'duplicates': 0}
+            if track_stats:
+                self.mutation_stats = stats
+            seen = self.make_dedup_filter(self.estimate_wordlist_size() if self.dedup == 'bloom' else None)
+            paths = self.mutator.expand(lambda first: self.read_wordlist(track_stats and first), seen, stats)
+        return self.sampled(paths) if self.sample_buckets > 1 else paths
+
+    def sampled(self, paths):
+        """Paths in this run's slice of the wordlist; successive weeks cover successive slices"""
+        for path in paths:
+            if zlib.crc32(path.encode()) % self.sample_buckets == self.sample_slice:
+                yield path
+
+    def read_wordlist(self, track_stats=True):
+        """Stream wordlist paths in file order, skipping comments and duplicates"""
+        compiled = self.open_wordlist()
+        if compiled is not None:
+            if track_stats:
+                self.wordlist_stats = {'unique': len(compiled), 'duplicates': compiled.duplicates}
+            return iter(compiled)
+        try:
+            file = open(self.wordlist_path, 'r', encoding='utf-8', errors='replace')
         except FileNotFoundError:
             self.console.print(f"[red]✗ Wordlist file not found: {self.wordlist_path}[/red]")
-            return []
+            return iter(())
         except Exception as e:
             self.console.print(f"[red]✗ Error loading wordlist: {e}[/red]")
-            return []
+            return iter(())
+        return self._stream_wordlist(file, track_stats)
+
+    def _stream_wordlist(self, file, track_stats=True):
+        seen = self.make_dedup_filter()
+        stats = {'unique': 0, 'duplicates': 0}
+        if track_stats:
+            self.wordlist_stats = stats
+        with file:
+            for line in file:
+                word = line.strip()
+                if not word or word.startswith('#'):
+                    continue
+                if not seen.add(word):
+                    stats['duplicates'] += 1
+                    continue
+                stats['unique'] += 1
+                yield word
+
+    def build_work_queue(self, wordlist):
+        """Work queue seeded with the wordlist; with recursion every queued path is deduplicated"""
+        if self.max_depth:
+            self.queued_paths = DigestSet()
+        self.work = WorkQueue()
+        if self.order != 'file' and self.path_stats:
+            self.load_learned()
+        if self.order is None:
+            self.order = 'prior' if self.learned else 'file'
+        if self.order == 'prior':
+            for tier, paths in self.prior_tiers(wordlist):
+                self.work.push(-0.1 * tier, self.base_paths(paths))
+        else:
+            self.work.push(0, self.base_paths(wordlist))
+        if self.tech.tags:
+            self.promote(self.tech.tags)
+        if self.check_backups:
+            self.backup_paths = self.queued_paths if self.queued_paths is not None else DigestSet()
+            archives = list(self.host_archives())
+            self.work.push(-1, self.unqueued_backups(archives), len(archives))
+        if self.baseline:
+            if self.queued_paths is not None:
+                for path in self.baseline.records:
+                    self.queued_paths.add(path)
+            self.work.push(-5, iter(list(self.baseline.records)), len(self.baseline), kind='revalidate')
+        for item in self.resumed_hits:
+            self.replay_hit(item)
+        return self.work
+
+    def replay_hit(self, item):
+        """Queue the recursion and backup follow-ups of a hit that was not classified in this scan"""
+        directory = self.max_depth and self.discovered_directory(item)
+        if directory:
+            self.queue_directory(directory)
+        if self.check_backups:
+            self.queue_backups(item)
+
+    def base_paths(self, paths):
+        """Filters every root-level wordlist stream goes through"""
+        if self.tech_mode != 'off':
+            paths = self.tech_filter(paths)
+        if self.max_depth:
+            paths = self.unqueued(paths)
+        elif self.baseline:
+            paths = (path for path in paths if normalize_path(path) not in self.baseline)
+        return paths
+
+    def prior_score(self, path):
+        """Prior tier of a path being worth requesting early: 4 if it hit in past scans, else +2 for an
+        admin keyword and +1 for a top-level path"""
+        if self.learned and normalize_path(path) in self.learned:
+            return 4
+        lowered = path.partition('?')[0].lower().strip('/')
+        score = 2 if self.admin_path_pattern.search(lowered) else 0
+        if '/' not in lowered:
+            score += 1
+        return score
+
+    def prior_tiers(self, wordlist):
+        """One lazy pass over the wordlist per prior tier, best tier first, nothing materialized"""
+        tiers = []
+        for tier in range(4 if self.learned else 3, -1, -1):
+            source = wordlist if not tiers else self.skip_completed(self.load_wordlist(track_stats=False))
+            tiers.append((tier, self.learned_paths(source) if tier == 4 else self.tier_paths(source, tier)))
+        return tiers
+
+    def learned_paths(self, paths):
+        """Wordlist entries that hit in past scans, most likely first; only these few are held in memory"""
+        learned = [(self.learned[normalize_path(path)], index, path)
+                   for index, path in enumerate(paths) if self.prior_score(path) == 4]
+        for _, _, path in sorted(learned, key=lambda entry: (-entry[0], entry[1])):
+            self.learned_promoted += 1
+            yield path
+
+    def load_learned(self):
+        """Hit probabilities from past scans for this target's technology"""
+        try:
+            self.learned = self.path_stats.probabilities(self.tech.tags)
+        except sqlite3.Error as e:
+            self.console.print(f"[yellow]! Path statistics unavailable ({e}), using the default order[/yellow]")
+            self.learned = {}
+        return self.learned
+
+    def record_path_stats(self):
+        """Add this scan's hits to the learned path statistics"""
+        hits = [(item['path'], item['status'])
+                for category in ['found', 'redirects', 'interesting', 'admin_panels']
+                for item in self.iter_results(category)]
+        try:
+            self.path_stats.record_scan(self.tech.tags, hits)
+        except sqlite3.Error as e:
+            self.console.print(f"[yellow]! Could not update path statistics: {e}[/yellow]")
+
+    def tier_paths(self, paths, tier):
+        for path in paths:
+            if self.prior_score(path) == tier:
+                yield path
+
+    @property
+    def stopped(self):
+        return self.stop_event.is_set()
+
+    def check_goal(self):
+        """Stop the scan once stop_after admin panels are confirmed"""
+        if self.stop_after and not self.stopped and self.count('admin_panels') >= self.stop_after:
+            self.stop_event.set()
+            self.console.print(f"[green]✓ Found {self.count('admin_panels')} admin panel(s), stopping early[/green]")
+
+    def unqueued(self, paths):
+        """Drop paths already queued from another directory, compared on their normalized form"""
+        for path in paths:
+            if self.queued_paths.add(normalize_path(path)):
+                yield path
+
+    def directory_paths(self, directory):
+        """Wordlist entries joined under a discovered directory"""
+        paths = (directory + word.lstrip('/') for word in self.load_wordlist(track_stats=False))
+        if self.tech_mode != 'off':
+            paths = self.tech_filter(paths)
+        for path in paths:
+            if path not in self.completed_paths:
+                yield path
+
+    def learn_tech(self, tags):
+        """Fold technology evidence into the profile, promoting matching paths once the queue exists"""
+        if self.tech_mode == 'off' or not tags:
+            return
+        new = self.tech.add(tags)
+        if new:
+            self.console.print(f"[cyan]⚙ Detected technology: {', '.join(sorted(new))}[/cyan]")
+            if self.work:
+                self.promote(new)
+
+    def promote(self, tags):
+        """Queue the wordlist entries tagged with any of tags ahead of everything else, application tags first"""
+        tags = set(tags) & set(TechProfile.PATH_TAGS.groupindex)
+        applications = tags - TechProfile.PLATFORMS
+        if applications:
+            self.work.push(-4, self.promoted_paths(frozenset(applications)))
+        if tags & TechProfile.PLATFORMS:
+            self.work.push(-3, self.promoted_paths(frozenset(tags & TechProfile.PLATFORMS)))
+
+    def promoted_paths(self, tags):
+        for path in self.load_wordlist(track_stats=False):
+            path_tags = TechProfile.path_tags(path)
+            if not path_tags & tags or path in self.completed_paths:
+                continue
+            if self.tech_mode == 'prune' and path_tags & self.tech.excluded:
+                continue
+            if self.tech.seen.add(path):
+                self.tech.promoted += 1
+                yield path
+
+    def tech_filter(self, paths):
+        """Skip tagged paths already promoted and, in prune mode, paths for platforms the target does not run"""
+        for path in paths:
+            tags = TechProfile.path_tags(path)
+            if not tags:
+                yield path
+                continue
+            if self.tech_mode == 'prune' and tags & self.tech.excluded:
+                self.tech.pruned += 1
+                continue
+            if self.tech.seen.add(path):
+                yield path
+
+    def fingerprint_target(self):
+        """Fetch the front page once to seed the technology profile"""
+        try:
+            self.count_request()
+            response = self.session.get(self.base_url + '/', timeout=self.timeout, stream=True,
+                                        verify=self.verify_ssl, allow_redirects=True)
+            content, _, _ = self.read_body(response)
+        except requests.RequestException:
+            return set()
+        body = content.decode(response.encoding or 'utf-8', errors='replace')
+        tags = TechProfile.detect(response.headers, body if response.status_code == 200 else '')
+        self.learn_tech(tags)
+        return tags
+
+    def directory_priority(self, directory):
+        """Shallow directories first; admin-looking ones jump ahead of the rest of the wordlist"""
+        depth = directory.strip('/').count('/') + 1
+        if any(kw in directory.lower() for kw in self.admin_keywords):
+            return depth - 1.5
+        return depth
+
+    def queue_directory(self, directory):
+        """Queue a discovered directory for recursion if it is within max_depth and not queued yet"""
+        if directory.strip('/').count('/') + 1 > self.max_depth:
+            return False
+        paths = self.unqueued(self.directory_paths(directory))
+        calibrate = self.soft_404 and directory not in self.baselines
+        return self.work.add(directory, self.directory_priority(directory), paths, calibrate)
+
+    def discovered_directory(self, result):
+        """Directory revealed by a result: a path ending in / or a redirect to the same path plus /"""
+        path = result['path']
+        status = result['status']
+        url = result['url'].rstrip('/') + '/'
+        if status in [200, 403] and (path.endswith('/') or result.get('final_url') == url):
+            return normalize_path(path.rstrip('/') + '/')
+        if status in [301, 302, 303, 307, 308]:
+            if urljoin(result['url'], result['headers'].get('Location', '')) == url:
+                return normalize_path(path.rstrip('/') + '/')
+        return None
+
+    def host_archives(self):
+        """Archive names derived from the target host, e.g. /example.com.zip and /example.tar.gz"""
+        host = urlparse(self.base_url).hostname or ''
+        bare = host[4:] if host.startswith('www.') else host
+        names = [host, bare]
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            names.append(bare.split('.')[0])
+        for name in dict.fromkeys(filter(None, names)):
+            for extension in self.archive_extensions:
+                yield f"/{name}{extension}"
+
+    def backup_variants(self, path):
+        """Backup names for one hit: suffixed and renamed copies of a file, archives of a directory"""
+        path = '/' + path.lstrip('/')
+        if '?' in path:
+            return
+        if path.endswith('/'):
+            name = path.rstrip('/')
+            if name:
+                for extension in self.archive_extensions:
+                    yield name + extension
+            return
+        
+        directory, _, name = path.rpartition('/')
+        suffixes = self.backup_keywords + [kw for category, kw in self.rules if category == 'backup']
+        for suffix in suffixes:
+            yield path + suffix
+        stem = name.rpartition('.')[0]
+        if stem:
+            yield f"{directory}/{stem}.bak"
+            yield f"{directory}/{stem}.old"
+        yield f"{directory}/.{name}.swp"
+
+    def unqueued_backups(self, paths):
+        """Drop backup candidates already queued or completed"""
+        for path in paths:
+            if path in self.completed_paths or not self.backup_paths.add(normalize_path(path)):
+                continue
+            self.backup_candidates += 1
+            yield path
+
+    def queue_backups(self, result):
+        """Queue backup variants of a hit ahead of the remaining wordlist, hits with keyword matches first"""
+        if result['status'] not in [200, 206, 403] or 'backup' in result.get('matches', {}):
+            return False
+        variants = list(self.backup_variants(self.discovered_directory(result) or result['path']))
+        if not variants:
+            return False
+        self.work.push(-2 if result.get('matches') else -1, self.unqueued_backups(variants), len(variants))
+        return True
+
+    def expected_paths(self, total_paths):
+        """Progress total grown by one wordlist per directory queued for recursion plus queued backup candidates"""
+        if not self.work:
+            return total_paths
+        return total_paths * (1 + self.work.directories) + self.work.extra
 
     def validate_url(self):
         """Validate if the base URL is accessible"""
@@ -151,147 +2281,641 @@ class AdvancedScanner:
         if 'php' in server or 'php' in content.lower():
             frameworks.append('PHP')
         
-        if 'x-powered-by' in headers:
-            frameworks.append(headers['x-powered-by'])
+        powered_by = next((value for name, value in headers.items() if name.lower() == 'x-powered-by'), None)
+        if powered_by:
+            frameworks.append(powered_by)
+        
+        return frameworks
+
+    def count_request(self):
+        """Thread-safe increment of the issued request counter"""
+        with self.stats_lock:
+            self.total_requests += 1
+
+    def build_pipeline(self, scan_type='full', check_backups=False):
+        """Build the ordered list of classifiers applied to every response"""
+        pipeline = [self.classify_framework, self.classify_keywords]
+        if scan_type in ['full', 'directories']:
+            pipeline += [self.classify_status, self.classify_backup, self.classify_interesting]
+        if scan_type in ['full', 'admin']:
+            pipeline.append(self.classify_admin)
+        if self.max_depth:
+            pipeline.append(self.classify_directory)
+        if check_backups:
+            if self.classify_backup not in pipeline:
+                pipeline.append(self.classify_backup)
+            pipeline.append(self.classify_backup_candidates)
+        return pipeline
+
+    def build_result(self, path, url, status, headers, content_length, response_time):
+        """Build the result record shared by every classifier and engine"""
+        response_category = self.categorize_response_time(response_time)
+        with self.stats_lock:
+            self.results['response_time_distribution'][response_category] += 1
+        
+        return {
+            'path': path,
+            'url': url,
+            'status': status,
+            'content_length': content_length,
+            'response_time': response_time,
+            'response_time_category': response_category,
+            'headers': headers,
+            'frameworks': [],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def fingerprint(self, path, status, headers, body):
+        """Fingerprint a response with the requested path removed from body and Location"""
+        token = path.strip('/')
+        location = headers.get('Location', '') if status in [301, 302, 303, 307, 308] else ''
+        if token:
+            body = body.replace(token, '')
+            location = location.replace(token, '')
+        return ResponseFingerprint(status, body, location)
+
+    def baseline_for(self, path):
+        """Baseline of the deepest calibrated directory containing path"""
+        directory = path.rstrip('/')
+        while directory:
+            directory = directory.rsplit('/', 1)[0] if '/' in directory else ''
+            baseline = self.baselines.get(directory + '/')
+            if baseline is not None:
+                return baseline
+        return self.baselines.get('/')
+
+    def calibrate(self, directory='/'):
+        """Request a few random non-existent paths under directory and store their fingerprints"""
+        baseline = SoftNotFoundBaseline(directory)
+        shapes = ['{}', '{}.php', '{}/', '.{}', '{}.html']
+        for i in range(self.calibration_probes):
+            path = directory + shapes[i % len(shapes)].format(uuid.uuid4().hex[:12])
+            try:
+                self.count_request()
+                response = self.session.get(urljoin(self.base_url, path), timeout=self.timeout, stream=True,
+                                            verify=self.verify_ssl, allow_redirects=self.follow_redirects)
+                content, _, _ = self.read_body(response)
+            except requests.RequestException:
+                continue
+            body = content.decode(response.encoding or 'utf-8', errors='replace')
+            baseline.add(self.fingerprint(path, response.status_code, response.headers, body))
+            self.learn_tech(TechProfile.detect(response.headers, body))
+        
+        self.baselines[directory] = baseline
+        if baseline.wildcard_statuses:
+            self.console.print(f"[yellow]! Wildcard responses detected under {directory} "
+                               f"(status {', '.join(map(str, baseline.wildcard_statuses))}), filtering soft-404s[/yellow]")
+        return baseline
+
+    def is_soft_404(self, result, body):
+        """True if the response looks like the target's catch-all page; a real 404 is never a soft-404"""
+        if result['status'] == 404:
+            return False
+        baseline = self.baseline_for(result['path'])
+        if baseline is None or result['status'] not in baseline.by_status:
+            return False
+        return baseline.matches(self.fingerprint(result['path'], result['status'], result['headers'], body))
+
+    def classify(self, result, body, pipeline=None):
+        """Run a result through the classifier pipeline, True if any classifier matched"""
+        if not self.journal:
+            return self.run_pipeline(result, body, pipeline)
+        
+        # Classifiers never await, so a thread-local is safe for the async engine too
+        self.local.records = []
+        try:
+            matched = self.run_pipeline(result, body, pipeline)
+            self.journal.append(result['path'], result['response_time_category'], self.local.records)
+        finally:
+            self.local.records = None
+        return matched
+
+    def run_pipeline(self, result, body, pipeline=None):
+        if self.soft_404 and self.is_soft_404(result, body):
+            with self.stats_lock:
+                self.soft_404_filtered += 1
+            return False
+        
+        matched = False
+        for classifier in pipeline or self.build_pipeline():
+            if classifier(result, body):
+                matched = True
+        return matched
+
+    def store(self, category, item):
+        """Keep an item in memory, or hand it to the sink writer when a sink is configured"""
+        if self.sink_writer:
+            self.sink_writer.put(category, item)
+            with self.stats_lock:
+                self.counts[category] += 1
+            return
+        with self.stats_lock:
+            self.results[category].append(item)
+            self.counts[category] += 1
+
+    def count(self, category):
+        return self.counts[category]
+
+    def iter_results(self, category):
+        """Items of one category, read back from the sink when results were streamed"""
+        if self.sink_writer:
+            self.sink_writer.close()
+            return self.sink.iter(category)
+        return iter(self.results[category])
+
+    def record(self, category, item):
+        """Store a classified item and remember it for the journal entry of the current path"""
+        self.store(category, item)
+        records = getattr(self.local, 'records', None)
+        if records is not None:
+            records.append((category, item))
+
+    def record_error(self, path, error):
+        """Record a failed request"""
+        self.record('errors', {'path': path, 'error': error, 'timestamp': datetime.now().isoformat()})
+        return None
+
+    def count_bytes(self, received=0, saved=0):
+        """Thread-safe update of the body transfer counters"""
+        with self.stats_lock:
+            self.bytes_received += received
+            self.bytes_saved += saved
+
+    def header_length(self, headers):
+        """Body size announced by Content-Length, 0 when absent or invalid"""
+        try:
+            return max(int(headers.get('Content-Length', 0)), 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def needs_body(self, path, status):
+        """Whether any classifier needs the body for a response with this status"""
+        if status == 200:
+            return True
+        if not self.soft_404:
+            return False
+        baseline = self.baseline_for(path)
+        return baseline is not None and status != 404 and status in baseline.by_status
+
+    def head_rejected(self, status):
+        """Switch to GET for the rest of the scan if the server does not support HEAD"""
+        if status in [405, 501] and self.head_supported:
+            self.head_supported = False
+            self.console.print(f"[yellow]! Server rejected HEAD ({status}), falling back to GET[/yellow]")
+        return not self.head_supported
+
+    def skip_body(self, headers):
+        """Account for a body we decided not to download"""
+        length = self.header_length(headers)
+        self.count_bytes(saved=length)
+        return length
+
+    def probe(self, path, url):
+        """Request url with the configured probe mode, returning (response, body, content_length, truncated)"""
+        options = {'timeout': self.timeout, 'verify': self.verify_ssl, 'allow_redirects': self.follow_redirects}
+        
+        if self.probe_mode == 'head' and self.head_supported:
+            response, timings = self.send('HEAD', url, **options)
+            self.observe_phases(response.status_code, timings)
+            if not self.head_rejected(response.status_code) and not self.needs_body(path, response.status_code):
+                return response, '', self.skip_body(response.headers), False
         
-        return frameworks
+        response, timings = self.send('GET', url, stream=True, **options)
+        if self.probe_mode != 'get':
+            length = self.header_length(response.headers)
+            if not self.needs_body(path, response.status_code) and length > self.drain_limit:
+                response.close()
+                self.observe_phases(response.status_code, timings)
+                return response, '', self.skip_body(response.headers), False
+        
+        start = time.perf_counter()
+        try:
+            content, content_length, truncated = self.read_body(response)
+        except requests.RequestException:
+            self.observe_phases('error', timings)
+            raise
+        timings['body'] = time.perf_counter() - start
+        self.observe_phases(response.status_code, timings)
+        return response, content.decode(response.encoding or 'utf-8', errors='replace'), content_length, truncated
 
-    def scan_path(self, path):
-        """Scan a single path with detailed analysis"""
-        if self.rate_limit > 0:
-            time.sleep(self.rate_limit)
+    def read_body(self, response):
+        """Read at most max_body_bytes of a streamed response, returning (content, content_length, truncated)"""
+        limit = self.max_body_bytes
+        if not limit:
+            content = response.content
+            self.count_bytes(received=len(content))
+            return content, len(content), False
         
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=min(65536, limit + 1)):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                break
+        content = b''.join(chunks)
+        self.count_bytes(received=len(content))
+        
+        if size <= limit:
+            return content, size, False
+        response.close()
+        with self.stats_lock:
+            self.truncated_bodies += 1
+        return content[:limit], self.header_length(response.headers) or size, True
+
+    def throttle(self):
+        """Wait for the shared rate limiter before sending a request, returning the seconds waited"""
+        if self.rate_limiter:
+            return self.rate_limiter.acquire()
+        return None
+
+    async def throttle_async(self):
+        if self.rate_limiter:
+            return await self.rate_limiter.acquire_async()
+        return None
+
+    def observe_phases(self, status, timings):
+        self.metrics.observe(self.metrics_host, status, timings)
+
+    def send(self, method, url, **options):
+        """Throttle, count and send one request, returning (response, phase timings) with the body not yet timed"""
+        waited = self.throttle()
+        timings = {} if waited is None else {'throttle': waited}
+        self.count_request()
+        REQUEST_PHASES.timings = timings
+        start = time.perf_counter()
         try:
-            url = urljoin(self.base_url, path)
-            response = self.session.get(url, timeout=self.timeout, verify=self.verify_ssl, 
-                                       allow_redirects=self.follow_redirects)
-            
-            response_time = response.elapsed.total_seconds()
-            response_category = self.categorize_response_time(response_time)
-            self.results['response_time_distribution'][response_category] += 1
-            
-            result = {
-                'path': path,
-                'url': url,
-                'status': response.status_code,
-                'content_length': len(response.content),
-                'response_time': response_time,
-                'response_time_category': response_category,
-                'headers': dict(response.headers),
-                'frameworks': self.detect_framework(dict(response.headers), response.text[:1000]),
-                'timestamp': datetime.now().isoformat()
-            }
-            
+            response = self.session.request(method, url, **options)
+        except requests.RequestException:
+            self.observe_phases('error', timings)
+            raise
+        finally:
+            REQUEST_PHASES.timings = None
+        network = sum(timings.get(phase, 0.0) for phase in ['dns', 'connect', 'tls'])
+        timings['ttfb'] = max(0.0, time.perf_counter() - start - network)
+        return response, timings
 
-            if response.status_code == 200:
-                result['found'] = True
-                self.results['found'].append(result)
-                
+    def report_response(self, status, headers, response_time):
+        """Feed the response back into the adaptive rate limiter"""
+        if not self.rate_limiter:
+            return
+        retry_after = headers.get('Retry-After', '')
+        self.rate_limiter.record_response(status, response_time,
+                                          float(retry_after) if retry_after.isdigit() else None)
 
-                live_entry = {
-                    'status': '✓',
-                    'path': path[:40],
-                    'code': response.status_code,
-                    'time': f"{response_time:.2f}s",
-                    'type': 'Found'
-                }
-                self.live_results.append(live_entry)
-                
-                if self.auto_browse:
-                    time.sleep(self.browse_delay)
-                    webbrowser.open(url)
-                return result
-            
+    def report_failure(self):
+        if self.rate_limiter:
+            self.rate_limiter.record_failure()
 
-            elif response.status_code in [301, 302, 303, 307, 308]:
-                result['redirect_to'] = response.headers.get('Location', 'Unknown')
-                self.results['redirects'].append(result)
-                
-                live_entry = {
-                    'status': '→',
-                    'path': path[:40],
-                    'code': response.status_code,
-                    'time': f"{response_time:.2f}s",
-                    'type': 'Redirect'
-                }
-                self.live_results.append(live_entry)
-                return result
-            
+    def should_retry_throttled(self, status, attempt):
+        """Re-queue a 429/503 behind the rate limiter instead of losing the path"""
+        return self.rate_limiter is not None and status in [429, 503] and attempt < self.throttle_retries
 
-            elif response.status_code in [201, 204, 206]:
-                self.results['found'].append(result)
-                
-                live_entry = {
-                    'status': '~',
-                    'path': path[:40],
-                    'code': response.status_code,
-                    'time': f"{response_time:.2f}s",
-                    'type': 'Success'
-                }
-                self.live_results.append(live_entry)
-                return result
+    def scan_path(self, path, pipeline=None):
+        """Fetch a single path once and run it through the classifier pipeline"""
+        if self.stopped:
+            return None
+        url = urljoin(self.base_url, path)
+        for attempt in range(self.throttle_retries + 1):
+            try:
+                response, body, content_length, truncated = self.probe(path, url)
+            except requests.Timeout:
+                self.report_failure()
+                return self.record_error(path, 'Timeout')
+            except requests.RequestException as e:
+                self.report_failure()
+                return self.record_error(path, str(e))
             
+            self.report_response(response.status_code, response.headers, response.elapsed.total_seconds())
+            if not self.should_retry_throttled(response.status_code, attempt):
+                break
+        
+        result = self.build_result(path, url, response.status_code, dict(response.headers),
+                                   content_length, response.elapsed.total_seconds())
+        if truncated:
+            result['truncated'] = True
+        if response.history:
+            result['final_url'] = response.url
+        if not self.timed_classify(result, body, pipeline):
+            return None
+        
+        if self.auto_browse and result['status'] == 200:
+            time.sleep(self.browse_delay)
+            open_in_browser(url)
+        return result
+
+    def timed_classify(self, result, body, pipeline):
+        """classify, booking its time as the classify phase"""
+        start = time.perf_counter()
+        try:
+            return self.classify(result, body, pipeline)
+        finally:
+            self.observe_phases(result['status'], {'classify': time.perf_counter() - start})
 
-            elif response.status_code == 403:
-                self.results['interesting'].append(result)
+    async def probe_async(self, session, path, url):
+        """Async counterpart of probe, returning (status, headers, body, content_length, truncated, response_time, final_url)"""
+        options = {'allow_redirects': self.follow_redirects, 'proxy': self.async_proxy}
+        
+        if self.probe_mode == 'head' and self.head_supported:
+            timings = await self.start_timings_async()
+            start = time.perf_counter()
+            try:
+                async with session.head(url, trace_request_ctx=timings, **options) as response:
+                    response_time = self.ttfb(timings, start)
+                    self.observe_phases(response.status, timings)
+                    if not self.head_rejected(response.status) and not self.needs_body(path, response.status):
+                        length = self.skip_body(response.headers)
+                        return response.status, dict(response.headers), '', length, False, response_time, str(response.url) if response.history else url
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                self.observe_phases('error', timings)
+                raise
+        
+        timings = await self.start_timings_async()
+        start = time.perf_counter()
+        try:
+            async with session.get(url, trace_request_ctx=timings, **options) as response:
+                response_time = self.ttfb(timings, start)
+                length = self.header_length(response.headers)
+                if self.probe_mode != 'get' and not self.needs_body(path, response.status) and length > self.drain_limit:
+                    response.close()
+                    self.observe_phases(response.status, timings)
+                    length = self.skip_body(response.headers)
+                    return response.status, dict(response.headers), '', length, False, response_time, str(response.url) if response.history else url
                 
-                live_entry = {
-                    'status': '!',
-                    'path': path[:40],
-                    'code': response.status_code,
-                    'time': f"{response_time:.2f}s",
-                    'type': 'Forbidden'
-                }
-                self.live_results.append(live_entry)
-                return result
+                start = time.perf_counter()
+                content, content_length, truncated = await self.read_body_async(response)
+                timings['body'] = time.perf_counter() - start
+                self.observe_phases(response.status, timings)
+                body = content.decode(response.charset or 'utf-8', errors='replace')
+                return response.status, dict(response.headers), body, content_length, truncated, response_time, str(response.url) if response.history else url
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            self.observe_phases('error', timings)
+            raise
+
+    async def start_timings_async(self):
+        """Throttle and count one async request, returning the timings dict its trace hooks fill in"""
+        waited = await self.throttle_async()
+        self.count_request()
+        return {} if waited is None else {'throttle': waited}
+
+    def ttfb(self, timings, start):
+        """Book the time to response headers not spent resolving or connecting as ttfb, returning the whole wait"""
+        elapsed = time.perf_counter() - start
+        timings['ttfb'] = max(0.0, elapsed - timings.get('dns', 0.0) - timings.get('connect', 0.0))
+        return elapsed
+
+    async def read_body_async(self, response):
+        """Async counterpart of read_body"""
+        limit = self.max_body_bytes
+        if not limit:
+            content = await response.read()
+            self.count_bytes(received=len(content))
+            return content, len(content), False
+        
+        chunks = []
+        size = 0
+        while size <= limit:
+            chunk = await response.content.read(limit + 1 - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        content = b''.join(chunks)
+        self.count_bytes(received=len(content))
+        
+        if size <= limit:
+            return content, size, False
+        response.close()
+        with self.stats_lock:
+            self.truncated_bodies += 1
+        return content[:limit], self.header_length(response.headers) or size, True
+
+    async def scan_path_async(self, session, path, pipeline=None):
+        """Async counterpart of scan_path for the asyncio engine"""
+        if self.stopped:
+            return None
+        url = urljoin(self.base_url, path)
+        for attempt in range(self.throttle_retries + 1):
+            try:
+                status, headers, body, content_length, truncated, response_time, final_url = await self.probe_async(session, path, url)
+            except asyncio.TimeoutError:
+                self.report_failure()
+                return self.record_error(path, 'Timeout')
+            except (aiohttp.ClientError, LookupError) as e:
+                self.report_failure()
+                return self.record_error(path, str(e))
             
+            self.report_response(status, headers, response_time)
+            if not self.should_retry_throttled(status, attempt):
+                break
+        result = self.build_result(path, url, status, headers, content_length, response_time)
+        if truncated:
+            result['truncated'] = True
+        if final_url != url:
+            result['final_url'] = final_url
+        if not self.timed_classify(result, body, pipeline):
             return None
-                
-        except requests.Timeout:
-            self.results['errors'].append({'path': path, 'error': 'Timeout', 'timestamp': datetime.now().isoformat()})
+        
+        if self.auto_browse and result['status'] == 200:
+            await asyncio.sleep(self.browse_delay)
+            open_in_browser(url)
+        return result
+
+    def run_task(self, task, pipeline=None):
+        """Run one work queue task: scan or revalidate a path, or calibrate a directory before releasing its paths"""
+        kind, value = task
+        if kind == 'calibrate':
+            try:
+                self.calibrate(value)
+            finally:
+                self.work.calibrated(value)
             return None
-        except requests.RequestException as e:
-            self.results['errors'].append({'path': path, 'error': str(e), 'timestamp': datetime.now().isoformat()})
+        if kind == 'revalidate':
+            return self.revalidate(value, pipeline)
+        return self.scan_path(value, pipeline)
+
+    async def run_task_async(self, session, task, pipeline=None):
+        """Async counterpart of run_task, calibration runs on the default executor"""
+        kind, value = task
+        if kind == 'calibrate':
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.calibrate, value)
+            finally:
+                self.work.calibrated(value)
             return None
+        if kind == 'revalidate':
+            return await asyncio.get_running_loop().run_in_executor(None, self.revalidate, value, pipeline)
+        return await self.scan_path_async(session, value, pipeline)
 
-    def scan_admin_panels(self, path):
-        """Enhanced admin panel detection"""
-        try:
-            url = urljoin(self.base_url, path)
-            response = self.session.get(url, timeout=self.timeout, verify=self.verify_ssl)
-            response_text = response.text.lower()
-            
-            matching_keywords = [kw for kw in self.admin_keywords if kw in response_text]
-            
-            if response.status_code == 200 and matching_keywords:
-                result = {
-                    'path': path,
-                    'url': url,
-                    'status': response.status_code,
-                    'keywords_found': matching_keywords,
-                    'content_length': len(response.content),
-                    'frameworks': self.detect_framework(dict(response.headers), response.text[:1000]),
-                    'timestamp': datetime.now().isoformat()
-                }
-                self.results['admin_panels'].append(result)
-                
-                live_entry = {
-                    'status': '★',
-                    'path': path[:40],
-                    'code': response.status_code,
-                    'time': '-',
-                    'type': 'Admin Panel'
-                }
-                self.live_results.append(live_entry)
-                
-                if self.auto_browse:
-                    time.sleep(self.browse_delay)
-                    webbrowser.open(url)
-                return result
+    def revalidate(self, path, pipeline=None):
+        """Re-check a baseline hit with a conditional GET or a HEAD, carrying it forward if unchanged
+        and scanning it in full otherwise"""
+        if self.stopped:
             return None
-                
+        url = urljoin(self.base_url, path)
+        headers = self.baseline.request_headers(path)
+        options = {'timeout': self.timeout, 'verify': self.verify_ssl, 'allow_redirects': self.follow_redirects,
+                   'headers': headers}
+        try:
+            if headers or not self.head_supported:
+                response, timings = self.send('GET', url, stream=True, **options)
+                response.close()
+            else:
+                response, timings = self.send('HEAD', url, **options)
+            self.observe_phases(response.status_code, timings)
         except requests.RequestException:
-            return None
+            self.report_failure()
+            response = None
+        
+        if response is not None:
+            self.report_response(response.status_code, response.headers, response.elapsed.total_seconds())
+            if self.baseline.unchanged(path, response.status_code, response.headers):
+                with self.stats_lock:
+                    self.revalidation_stats['unchanged'] += 1
+                    self.revalidated.add(path)
+                for category, item in self.baseline.records[path]:
+                    self.store(category, item)
+                    if category != 'admin_panels':
+                        self.replay_hit(item)
+                return None
+        
+        with self.stats_lock:
+            self.revalidation_stats['refetched'] += 1
+        result = self.scan_path(path, pipeline)
+        if not self.stopped:
+            with self.stats_lock:
+                self.revalidated.add(path)
+        return result
+
+    def build_diff(self):
+        """Diff this scan's hits against the baseline"""
+        current = defaultdict(list)
+        for category in ScanBaseline.CATEGORIES:
+            for item in self.iter_results(category):
+                current[normalize_path(item['path'])].append((category, item))
+        self.diff = self.baseline.diff(current, self.revalidated)
+        return self.diff
+
+    def save_diff(self, prefix='scan_diff'):
+        """Write the diff against the baseline as JSON"""
+        filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(filename, 'w') as f:
+            json.dump({'target': self.base_url, 'baseline': self.baseline.files,
+                       'sample': f"{self.sample_slice + 1}/{self.sample_buckets}", **self.diff}, f, indent=4)
+        return filename
+
+    def scan_admin_panels(self, path):
+        """Admin panel detection only (single request, admin classifier)"""
+        return self.scan_path(path, self.build_pipeline('admin'))
+
+    def add_live_entry(self, status, result, entry_type):
+        """Append a row for the live results table"""
+        self.live_results.append({
+            'status': status,
+            'path': result['path'][:40],
+            'code': result['status'],
+            'time': f"{result['response_time']:.2f}s",
+            'type': entry_type
+        })
+
+    def classify_framework(self, result, body):
+        """Annotate the result with detected server technology and feed the technology profile"""
+        result['frameworks'] = self.detect_framework(result['headers'], body[:1000])
+        if self.tech_mode != 'off':
+            self.learn_tech(TechProfile.detect(result['headers'], body if result['status'] == 200 else ''))
+        return False
+
+    def classify_keywords(self, result, body):
+        """Match the path, and the body of reachable pages, against every keyword rule in one pass each"""
+        matches = self.matcher.match(result['path'], body if result['status'] == 200 else None)
+        if matches:
+            result['matches'] = matches
+        return False
+
+    def classify_status(self, result, body):
+        """Bucket the response by status code"""
+        status = result['status']
+        
+        if status == 200:
+            result['found'] = True
+            self.record('found', result)
+            self.add_live_entry('✓', result, 'Found')
+            return True
+        
+        elif status in [301, 302, 303, 307, 308]:
+            result['redirect_to'] = result['headers'].get('Location', 'Unknown')
+            self.record('redirects', result)
+            self.add_live_entry('→', result, 'Redirect')
+            return True
+        
+        elif status in [201, 204, 206]:
+            self.record('found', result)
+            self.add_live_entry('~', result, 'Success')
+            return True
+        
+        elif status == 403:
+            self.record('interesting', result)
+            self.add_live_entry('!', result, 'Forbidden')
+            return True
+        
+        return False
+
+    def classify_directory(self, result, body):
+        """Queue a discovered directory for recursion; not a finding on its own"""
+        directory = self.discovered_directory(result)
+        if directory:
+            self.queue_directory(directory)
+        return False
+
+    def classify_backup_candidates(self, result, body):
+        """Queue backup variants of a hit; not a finding on its own"""
+        self.queue_backups(result)
+        return False
+
+    def classify_admin(self, result, body):
+        """Flag reachable pages whose body looks like an admin panel"""
+        if result['status'] != 200:
+            return False
+        
+        matching_keywords = result.get('matches', {}).get('admin')
+        if not matching_keywords:
+            return False
+        
+        self.record('admin_panels', {
+            'path': result['path'],
+            'url': result['url'],
+            'status': result['status'],
+            'keywords_found': matching_keywords,
+            'content_length': result['content_length'],
+            'frameworks': result['frameworks'],
+            'timestamp': result['timestamp']
+        })
+        self.add_live_entry('★', result, 'Admin Panel')
+        self.check_goal()
+        return True
+
+    def classify_backup(self, result, body):
+        """Tag reachable paths that look like backup or archive files"""
+        if result['status'] not in [200, 206]:
+            return False
+        
+        if 'backup' not in result.get('matches', {}):
+            return False
+        
+        self.record('backup_files', result)
+        self.add_live_entry('B', result, 'Backup')
+        return True
+
+    def classify_interesting(self, result, body):
+        """Tag reachable paths whose name suggests sensitive content"""
+        if result['status'] != 200:
+            return False
+        
+        if 'interesting' not in result.get('matches', {}):
+            return False
+        
+        self.record('interesting', result)
+        return True
 
     def update_live_display(self, total_scanned, total_paths):
         """Create live display table"""
@@ -303,7 +2927,7 @@ class AdvancedScanner:
         table.add_column("Type", style="yellow", width=12)
         
 
-        for entry in self.live_results[-15:]:
+        for entry in list(self.live_results)[-15:]:
             status_style = "green" if entry['status'] == "✓" else "yellow" if entry['status'] in ["→", "!"] else "cyan" if entry['status'] == "★" else "white"
             table.add_row(
                 f"[{status_style}]{entry['status']}[/{status_style}]",
@@ -314,41 +2938,52 @@ class AdvancedScanner:
             )
         
 
-        summary_text = f"[cyan]Scanned: {total_scanned}/{total_paths} | Found: {len(self.results['found'])} | Admin: {len(self.results['admin_panels'])} | Errors: {len(self.results['errors'])}[/cyan]"
+        summary_text = f"[cyan]Scanned: {total_scanned}/{self.expected_paths(total_paths)} | Found: {self.count('found')} | Admin: {self.count('admin_panels')} | Errors: {self.count('errors')}[/cyan]"
+        if self.rate_limiter:
+            summary_text += f"[cyan] | Rate: {self.rate_limiter.rate:.1f}/{self.max_rps:.0f} req/s[/cyan]"
         
         return table, summary_text
 
-    def save_scan_results(self, format='json'):
+    def live_display(self, total_paths):
+        """Live display redrawn from the counters and the live_results ring on rich's refresh thread"""
+        if not self.live_enabled:
+            return nullcontext()
+        def render():
+            table, summary = self.update_live_display(self.scanned, total_paths)
+            return Group(table, summary)
+        self.live = TimedLive(render, self.console, self.refresh_per_second)
+        return self.live
+
+    def save_scan_results(self, format='json', prefix='scan_results'):
         """Save results to file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if format == 'json':
-            filename = f"scan_results_{timestamp}.json"
+            filename = f"{prefix}_{timestamp}.json"
             with open(filename, 'w') as f:
-                json.dump(self.results, f, indent=4, default=str)
+                self._write_json_results(f)
         
         elif format == 'csv':
-            filename = f"scan_results_{timestamp}.csv"
+            filename = f"{prefix}_{timestamp}.csv"
             with open(filename, 'w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(['Type', 'Path', 'URL', 'Status Code', 'Response Time', 'Content Length', 'Timestamp'])
                 
-                for item in self.results['found']:
+                for item in self.iter_results('found'):
                     writer.writerow(['Found', item['path'], item['url'], item['status'], 
                                    f"{item['response_time']:.2f}s", item['content_length'], item['timestamp']])
-                for item in self.results['admin_panels']:
+                for item in self.iter_results('admin_panels'):
                     writer.writerow(['Admin Panel', item['path'], item['url'], item['status'], 'N/A', item['content_length'], item['timestamp']])
-                for item in self.results['redirects']:
+                for item in self.iter_results('redirects'):
                     writer.writerow(['Redirect', item['path'], item['url'], item['status'], 'N/A', 'N/A', item['timestamp']])
         
         elif format == 'html':
-            filename = f"scan_results_{timestamp}.html"
-            html = self._generate_html_report()
-            with open(filename, 'w') as f:
-                f.write(html)
+            filename = f"{prefix}_{timestamp}.html"
+            with open(filename, 'w', encoding='utf-8') as f:
+                self._write_html_report(f)
         
         elif format == 'txt':
-            filename = f"scan_results_{timestamp}.txt"
+            filename = f"{prefix}_{timestamp}.txt"
             with open(filename, 'w') as f:
                 f.write("=" * 80 + "\n")
                 f.write("HAIDER TOOLS - SCAN RESULTS\n")
@@ -359,399 +2994,51 @@ class AdvancedScanner:
                 
                 f.write("FOUND PATHS:\n")
                 f.write("-" * 80 + "\n")
-                for item in self.results['found']:
+                for item in self.iter_results('found'):
                     f.write(f"{item['path']} ({item['status']}) - {item['response_time']:.2f}s\n")
                 
                 f.write("\n\nADMIN PANELS:\n")
                 f.write("-" * 80 + "\n")
-                for item in self.results['admin_panels']:
+                for item in self.iter_results('admin_panels'):
                     f.write(f"{item['path']} - Keywords: {', '.join(item['keywords_found'])}\n")
                 
                 f.write("\n\nREDIRECTS:\n")
                 f.write("-" * 80 + "\n")
-                for item in self.results['redirects']:
+                for item in self.iter_results('redirects'):
                     f.write(f"{item['path']} -> {item.get('redirect_to', 'Unknown')}\n")
         
         return filename
 
-    def _generate_html_report(self):
-        """Generate detailed HTML report with clickable links"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        scan_date_short = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-
-        total_found = len(self.results['found'])
-        total_admin = len(self.results['admin_panels'])
-        total_redirects = len(self.results['redirects'])
-        total_errors = len(self.results['errors'])
-        
-        found_rows = ''.join(f"""
-            <tr>
-                <td><a href="{r['url']}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: bold;">{r['path']}</a></td>
-                <td><span class="status-badge status-{r['status']}">{r['status']}</span></td>
-                <td>{r['response_time']:.2f}s</td>
-                <td>{r['content_length']} bytes</td>
-                <td><button class="copy-btn" onclick="copyToClipboard('{r['url']}')">📋</button></td>
-            </tr>
-        """ for r in self.results['found'])
-        
-        admin_rows = ''.join(f"""
-            <tr>
-                <td><a href="{r['url']}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: bold;">{r['path']}</a></td>
-                <td><span class="keywords">{', '.join(r['keywords_found'])}</span></td>
-                <td><span class="status-badge status-{r['status']}">{r['status']}</span></td>
-                <td><button class="copy-btn" onclick="copyToClipboard('{r['url']}')">📋</button></td>
-            </tr>
-        """ for r in self.results['admin_panels'])
-        
-        redirect_rows = ''.join(f"""
-            <tr>
-                <td><a href="{r['url']}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: bold;">{r['path']}</a></td>
-                <td><a href="{r.get('redirect_to', '#')}" target="_blank" style="color: #f39c12; text-decoration: none;">{r.get('redirect_to', 'Unknown')}</a></td>
-                <td><span class="status-badge status-{r['status']}">{r['status']}</span></td>
-                <td><button class="copy-btn" onclick="copyToClipboard('{r['url']}')">📋</button></td>
-            </tr>
-        """ for r in self.results['redirects'])
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Haider Tools - Scan Report</title>
-            <style>
-                * {{
-                    margin: 0;
-                    padding: 0;
-                    box-sizing: border-box;
-                }}
-                
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    padding: 20px;
-                }}
-                
-                .container {{
-                    max-width: 1400px;
-                    margin: 0 auto;
-                }}
-                
-                .header {{
-                    background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-                    color: white;
-                    padding: 40px;
-                    border-radius: 10px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-                    margin-bottom: 30px;
-                    text-align: center;
-                }}
-                
-                .header h1 {{
-                    font-size: 2.5em;
-                    margin-bottom: 10px;
-                    text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-                }}
-                
-                .header p {{
-                    font-size: 1.1em;
-                    opacity: 0.9;
-                    margin: 5px 0;
-                }}
-                
-                .summary {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 20px;
-                    margin-bottom: 30px;
-                }}
-                
-                .card {{
-                    background: white;
-                    padding: 25px;
-                    border-radius: 10px;
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    text-align: center;
-                    transition: transform 0.3s ease, box-shadow 0.3s ease;
-                }}
-                
-                .card:hover {{
-                    transform: translateY(-5px);
-                    box-shadow: 0 15px 30px rgba(0,0,0,0.2);
-                }}
-                
-                .card h3 {{
-                    color: #2c3e50;
-                    margin-bottom: 10px;
-                    font-size: 1.1em;
-                }}
-                
-                .card .number {{
-                    font-size: 2.5em;
-                    font-weight: bold;
-                    color: #667eea;
-                    text-shadow: 1px 1px 2px rgba(0,0,0,0.05);
-                }}
-                
-                .section {{
-                    background: white;
-                    padding: 30px;
-                    border-radius: 10px;
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    margin-bottom: 30px;
-                }}
-                
-                .section h2 {{
-                    color: #2c3e50;
-                    margin-bottom: 20px;
-                    padding-bottom: 10px;
-                    border-bottom: 3px solid #667eea;
-                    font-size: 1.8em;
-                }}
-                
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-top: 15px;
-                }}
-                
-                th {{
-                    background: linear-gradient(135deg, #34495e 0%, #2c3e50 100%);
-                    color: white;
-                    padding: 15px;
-                    text-align: left;
-                    font-weight: 600;
-                    border: none;
-                }}
-                
-                td {{
-                    padding: 12px 15px;
-                    border-bottom: 1px solid #ecf0f1;
-                    word-break: break-word;
-                }}
-                
-                tr:hover {{
-                    background-color: #f8f9fa;
-                    transition: background-color 0.2s ease;
-                }}
-                
-                tr:last-child td {{
-                    border-bottom: none;
-                }}
-                
-                a {{
-                    color: #667eea;
-                    text-decoration: none;
-                    font-weight: 600;
-                    transition: color 0.2s ease;
-                }}
-                
-                a:hover {{
-                    color: #764ba2;
-                    text-decoration: underline;
-                }}
-                
-                .status-badge {{
-                    display: inline-block;
-                    padding: 5px 12px;
-                    border-radius: 20px;
-                    font-weight: 600;
-                    font-size: 0.9em;
-                }}
-                
-                .status-200 {{
-                    background-color: #d4edda;
-                    color: #155724;
-                }}
-                
-                .status-301, .status-302, .status-303, .status-307, .status-308 {{
-                    background-color: #fff3cd;
-                    color: #856404;
-                }}
-                
-                .status-403 {{
-                    background-color: #f8d7da;
-                    color: #721c24;
-                }}
-                
-                .status-404 {{
-                    background-color: #e2e3e5;
-                    color: #383d41;
-                }}
-                
-                .copy-btn {{
-                    background-color: #667eea;
-                    color: white;
-                    border: none;
-                    padding: 6px 10px;
-                    border-radius: 5px;
-                    cursor: pointer;
-                    font-size: 0.9em;
-                    transition: background-color 0.2s ease;
-                }}
-                
-                .copy-btn:hover {{
-                    background-color: #764ba2;
-                }}
-                
-                .keywords {{
-                    background-color: #e8f4f8;
-                    color: #0c5460;
-                    padding: 4px 8px;
-                    border-radius: 4px;
-                    font-size: 0.9em;
-                }}
-                
-                .footer {{
-                    text-align: center;
-                    color: white;
-                    margin-top: 40px;
-                    padding: 20px;
-                    font-size: 0.95em;
-                }}
-                
-                .empty-state {{
-                    text-align: center;
-                    padding: 40px;
-                    color: #7f8c8d;
-                    font-size: 1.1em;
-                }}
-                
-                .filter-btn {{
-                    background-color: #667eea;
-                    color: white;
-                    border: none;
-                    padding: 10px 20px;
-                    border-radius: 5px;
-                    cursor: pointer;
-                    margin: 10px 5px;
-                    font-size: 1em;
-                    transition: background-color 0.2s ease;
-                }}
-                
-                .filter-btn:hover {{
-                    background-color: #764ba2;
-                }}
-                
-                .filter-btn.active {{
-                    background-color: #764ba2;
-                }}
-                
-                @media print {{
-                    body {{
-                        background: white;
-                    }}
-                    .copy-btn, .filter-btn {{
-                        display: none;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🔍 Haider Tools - Scan Report</h1>
-                    <p><strong>Target:</strong> {self.base_url}</p>
-                    <p><strong>Scan Date:</strong> {timestamp}</p>
-                    <p><strong>Report ID:</strong> {scan_date_short}</p>
-                </div>
-                
-                <div class="summary">
-                    <div class="card">
-                        <h3>✓ Found Paths</h3>
-                        <div class="number">{total_found}</div>
-                    </div>
-                    <div class="card">
-                        <h3>★ Admin Panels</h3>
-                        <div class="number">{total_admin}</div>
-                    </div>
-                    <div class="card">
-                        <h3>→ Redirects</h3>
-                        <div class="number">{total_redirects}</div>
-                    </div>
-                    <div class="card">
-                        <h3>✗ Errors</h3>
-                        <div class="number">{total_errors}</div>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2>📁 Found Paths & Directories</h2>
-                    {"<table>" + """
-                        <thead>
-                            <tr>
-                                <th style="width: 40%;">Path / URL</th>
-                                <th style="width: 10%;">Status</th>
-                                <th style="width: 15%;">Response Time</th>
-                                <th style="width: 20%;">Content Length</th>
-                                <th style="width: 10%;">Action</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                    """ + (found_rows if found_rows else '<tr><td colspan="5" class="empty-state">No paths found</td></tr>') + """
-                        </tbody>
-                    </table>""" if total_found > 0 else '<div class="empty-state">No paths found during scan</div>'}
-                </div>
-                
-                <div class="section">
-                    <h2>★ Admin Panels Detected</h2>
-                    {"<table>" + """
-                        <thead>
-                            <tr>
-                                <th style="width: 35%;">Path / URL</th>
-                                <th style="width: 25%;">Keywords Found</th>
-                                <th style="width: 15%;">Status</th>
-                                <th style="width: 10%;">Action</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                    """ + (admin_rows if admin_rows else '<tr><td colspan="4" class="empty-state">No admin panels detected</td></tr>') + """
-                        </tbody>
-                    </table>""" if total_admin > 0 else '<div class="empty-state">No admin panels detected during scan</div>'}
-                </div>
-                
-                <div class="section">
-                    <h2>→ Redirects</h2>
-                    {"<table>" + """
-                        <thead>
-                            <tr>
-                                <th style="width: 30%;">Original Path</th>
-                                <th style="width: 40%;">Redirects To</th>
-                                <th style="width: 15%;">Status</th>
-                                <th style="width: 10%;">Action</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                    """ + (redirect_rows if redirect_rows else '<tr><td colspan="4" class="empty-state">No redirects found</td></tr>') + """
-                        </tbody>
-                    </table>""" if total_redirects > 0 else '<div class="empty-state">No redirects detected during scan</div>'}
-                </div>
-                
-                <div class="footer">
-                    <p>Generated by Haider Tools | Advanced Web Scanner</p>
-                    <p>All links are clickable and can be opened directly in your browser</p>
-                </div>
-            </div>
+    def _write_json_results(self, f):
+        """Write the results dict as indented JSON one item at a time"""
+        f.write("{")
+        for index, category in enumerate(self.results):
+            f.write(("," if index else "") + f"\n    {json.dumps(category)}: ")
+            if category == 'response_time_distribution':
+                f.write(textwrap.indent(json.dumps(self.results[category], indent=4), "    ").lstrip())
+                continue
             
-            <script>
-                function copyToClipboard(text) {{
-                    navigator.clipboard.writeText(text).then(() => {{
-                        alert('URL copied to clipboard: ' + text);
-                    }}).catch(() => {{
-                        alert('Failed to copy URL');
-                    }});
-                }}
-                
-                function printReport() {{
-                    window.print();
-                }}
-            </script>
-        </body>
-        </html>
-        """
-        return html
+            empty = True
+            for item in self.iter_results(category):
+                f.write(("[" if empty else ",") + "\n" + textwrap.indent(json.dumps(item, indent=4, default=str), "        "))
+                empty = False
+            f.write("[]" if empty else "\n    ]")
+        f.write("\n}")
+
+    def _write_html_report(self, f):
+        """Stream the HTML report one result at a time"""
+        report = HtmlReport(f)
+        report.start(self.base_url, {category: self.count(category) for category in HtmlReport.CARDS})
+        for category, title, columns in HtmlReport.SECTIONS:
+            report.section(category, title, columns, self.iter_results(category))
+        report.finish()
+
+    def format_bytes(self, size):
+        """Human readable byte count"""
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if size < 1024 or unit == 'GB':
+                return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+            size /= 1024
 
     def display_summary(self):
         """Display comprehensive scan summary"""
@@ -760,26 +3047,206 @@ class AdvancedScanner:
         table.add_column("Category", style="cyan", width=20)
         table.add_column("Count", style="magenta", justify="right", width=10)
         
-        table.add_row("✓ Found Paths", str(len(self.results['found'])))
-        table.add_row("★ Admin Panels", str(len(self.results['admin_panels'])))
-        table.add_row("→ Redirects", str(len(self.results['redirects'])))
-        table.add_row("⚠ Interesting", str(len(self.results['interesting'])))
-        table.add_row("✗ Errors", str(len(self.results['errors'])))
+        table.add_row("≡ Unique Paths", str(self.wordlist_stats['unique']))
+        table.add_row("≠ Duplicates", str(self.wordlist_stats['duplicates']))
+        if self.mutator:
+            table.add_row("✚ Expanded Paths", str(self.mutation_stats['paths']))
+        if self.resumed_paths:
+            table.add_row("↺ Resumed Paths", str(self.resumed_paths))
+        table.add_row("✓ Found Paths", str(self.count('found')))
+        table.add_row("★ Admin Panels", str(self.count('admin_panels')))
+        table.add_row("→ Redirects", str(self.count('redirects')))
+        table.add_row("⚠ Interesting", str(self.count('interesting')))
+        table.add_row("B Backup Files", str(self.count('backup_files')))
+        if self.check_backups:
+            table.add_row("B Backup Candidates", str(self.backup_candidates))
+        table.add_row("✗ Errors", str(self.count('errors')))
+        table.add_row("≈ Soft-404 Filtered", str(self.soft_404_filtered))
+        if self.tech_mode != 'off':
+            table.add_row("⚙ Technology", ", ".join(sorted(self.tech.tags)) or "-")
+            table.add_row("⇡ Promoted Paths", str(self.tech.promoted))
+            table.add_row("⊘ Pruned Paths", str(self.tech.pruned))
+        if self.max_depth:
+            table.add_row("↳ Directories Queued", str(self.work.directories if self.work else 0))
+        table.add_row("⇄ Requests Sent", str(self.total_requests))
+        if self.live:
+            table.add_row("🖥 UI Refreshes", f"{self.live.frames} ({self.live.seconds * 1000:.1f} ms off the scan loop)")
+        if self.learned:
+            table.add_row("☰ Learned Paths First", str(self.learned_promoted))
+        if self.diff is not None:
+            table.add_row("↻ Baseline Unchanged", str(self.revalidation_stats['unchanged']))
+            table.add_row("↻ Baseline Refetched", str(self.revalidation_stats['refetched']))
+            table.add_row("Δ New Paths", str(len(self.diff['new'])))
+            table.add_row("Δ Removed Paths", str(len(self.diff['removed'])))
+            table.add_row("Δ Changed Paths", str(len(self.diff['changed'])))
+        if self.sample_buckets > 1:
+            table.add_row("◔ Wordlist Slice", f"{self.sample_slice + 1}/{self.sample_buckets}")
+        if self.stopped:
+            full_scan = max(self.expected_paths(self.total_paths), 1)
+            table.add_row("⏹ Stopped Early", f"{self.count('admin_panels')} admin panel(s)")
+            table.add_row("⇄ vs Full Scan", f"{self.total_requests}/~{full_scan} ({100 * self.total_requests / full_scan:.1f}%)")
+        if self.rate_limiter:
+            table.add_row("⏱ Final Rate", f"{self.rate_limiter.rate:.1f} req/s")
+            table.add_row("⏱ Rate Back-offs", str(self.rate_limiter.backoffs))
+        table.add_row("⬇ Body Bytes", self.format_bytes(self.bytes_received))
+        table.add_row("⬇ Bytes Saved", self.format_bytes(self.bytes_saved))
+        table.add_row("✂ Truncated Bodies", str(self.truncated_bodies))
+        table.add_row("⚡ Conns Opened", str(self.connection_stats.opened))
+        table.add_row("♻ Conns Reused", str(self.connection_stats.reused))
+        table.add_row("✗ Conns Discarded", str(self.connection_stats.discarded))
         
         self.console.print(table)
+        phases = phase_table(self.metrics)
+        if phases:
+            self.console.print(phases)
+
+    def check_async_engine(self):
+        """Check the async engine can serve this scan, otherwise fall back to threads"""
+        if load_aiohttp() is None:
+            self.console.print("[yellow]! aiohttp is not installed, falling back to the thread engine[/yellow]")
+            return False
+        if self.proxy and not self.proxy['http'].startswith(('http://', 'https://')):
+            self.console.print("[yellow]! Async engine supports HTTP proxies only, falling back to the thread engine[/yellow]")
+            return False
+        return True
+
+    def run_threaded(self, work, pipeline, total_paths):
+        """Drain the work queue on a thread pool, keeping at most submit_window x threads futures in flight"""
+        max_in_flight = self.threads * self.submit_window
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            with self.live_display(total_paths):
+                while True:
+                    while not self.stopped and len(in_flight) < max_in_flight:
+                        task = work.next()
+                        if task is None:
+                            break
+                        in_flight[executor.submit(self.run_task, task, pipeline)] = task
+                    
+                    if not in_flight:
+                        break
+                    
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = in_flight.pop(future)
+                        if future.cancelled():
+                            continue
+                        if task[0] != 'calibrate':
+                            self.scanned += 1
+                        if future.exception() is not None:
+                            self.record_task_failure(task, future.exception())
+                    
+                    if self.stopped:
+                        # Queued futures never start; the few already running finish on their own
+                        for future in in_flight:
+                            future.cancel()
+
+    async def run_async(self, work, pipeline, total_paths):
+        """Drain the work queue on one event loop, concurrency bounded by a semaphore"""
+        semaphore = asyncio.Semaphore(self.threads)
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=None if self.verify_ssl else False,
+                                         force_close=not self.keep_alive)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        pending = {}
+        
+        with self.live_display(total_paths):
+            def on_done(future):
+                semaphore.release()
+                task = pending.pop(future)
+                if future.cancelled():
+                    return
+                if task[0] != 'calibrate':
+                    self.scanned += 1
+                if future.exception() is not None:
+                    self.record_task_failure(task, future.exception())
+            
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers={'User-Agent': self.user_agent},
+                                             trace_configs=[self.build_trace_config()]) as session:
+                while True:
+                    await semaphore.acquire()
+                    if self.stopped:
+                        semaphore.release()
+                        running = list(pending)
+                        for future in running:
+                            future.cancel()
+                        await asyncio.gather(*running, return_exceptions=True)
+                        break
+                    task = work.next()
+                    if task is None:
+                        semaphore.release()
+                        if not pending:
+                            break
+                        await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                        continue
+                    future = asyncio.ensure_future(self.run_task_async(session, task, pipeline))
+                    pending[future] = task
+                    future.add_done_callback(on_done)
+
+    def record_task_failure(self, task, error):
+        """Log a task that crashed instead of finishing, and record it as an error for its path"""
+        kind, value = task
+        logging.error("%s task for %s failed", kind, value, exc_info=error)
+        if kind != 'calibrate':
+            self.record_error(value, f"{type(error).__name__}: {error}")
+
+    def journal_header(self, scan_type):
+        return {'base_url': self.base_url, 'wordlist': os.path.abspath(self.wordlist_path), 'scan_type': scan_type}
+
+    def resume_from_journal(self, scan_type='full'):
+        """Rebuild results from the journal and remember which paths are already done"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            self.console.print(f"[yellow]! No journal to resume from at {self.journal_path}, starting a fresh scan[/yellow]")
+            return False
+        
+        expected = self.journal_header(scan_type)
+        for header, entries in ScanJournal.replay(self.journal_path):
+            mismatched = [key for key, value in expected.items() if header.get(key) != value]
+            if mismatched:
+                self.console.print(f"[red]✗ Journal {self.journal_path} was written for a different "
+                                   f"{', '.join(key.replace('_', ' ') for key in mismatched)}, starting a fresh scan[/red]")
+                return False
+            for entry in entries:
+                if not self.completed_paths.add(entry['path']):
+                    continue
+                self.results['response_time_distribution'][entry['rt']] += 1
+                for category, item in entry['records']:
+                    self.store(category, item)
+                    if (self.max_depth or self.check_backups) and category != 'errors':
+                        self.resumed_hits.append(item)
+        
+        self.resumed_paths = len(self.completed_paths)
+        self.console.print(f"[green]✓ Resuming: {self.resumed_paths} paths already completed in {self.journal_path}[/green]")
+        return True
+
+    def skip_completed(self, wordlist):
+        """Drop wordlist entries the journal already has"""
+        for path in wordlist:
+            if path not in self.completed_paths:
+                yield path
 
-    def run(self, scan_type='full', check_backups=False):
+    def run(self, scan_type='full', check_backups=False, resume=False):
         """Main scan execution with live display"""
         self.scan_start_time = time.time()
+        self.check_backups = check_backups
         
         wordlist = self.load_wordlist()
-        if not wordlist:
+        first_path = next(wordlist, None)
+        if first_path is None:
             self.console.print("[red]No valid paths to scan. Exiting.[/red]")
             return
+        wordlist = itertools.chain([first_path], wordlist)
+        total_paths = self.estimate_wordlist_size()
+        self.total_paths = total_paths
 
 
         if self.proxy:
             if not self.validate_proxy():
+                if not self.interactive:
+                    self.console.print("[red]✗ Proxy validation failed[/red]")
+                    return
+                from rich.prompt import Prompt
                 console_continue = Prompt.ask("[yellow]Proxy validation failed. Continue without proxy?[/yellow]", choices=["y", "n"])
                 if console_continue.lower() != 'y':
                     return
@@ -789,6 +3256,9 @@ class AdvancedScanner:
 
         if not self.validate_url():
             return
+        
+        if self.tech_mode != 'off':
+            self.fingerprint_target()
 
         self.console.print(f"\n[bold cyan]Starting scan on: {self.base_url}[/bold cyan]")
         if self.proxy:
@@ -796,48 +3266,334 @@ class AdvancedScanner:
         else:
             self.console.print("[cyan]Proxy: None\n[/cyan]")
         
-        total_scanned = 0
+        if self.sink:
+            self.sink_writer = SinkWriter(self.sink)
+            self.sink_writer.start()
+        metrics_exporter = start_metrics(self.console, lambda: self.metrics, self.metrics_port,
+                                         self.metrics_file, self.metrics_interval)
         
-        if scan_type in ['full', 'directories']:
-            with ThreadPoolExecutor(max_workers=self.threads) as executor:
-                futures = {executor.submit(self.scan_path, path): path for path in wordlist}
-                
-                with Live(self.console.print("Initializing..."), refresh_per_second=2) as live:
-                    for future in as_completed(futures):
-                        try:
-                            result = future.result()
-                            total_scanned += 1
-                            
-                            if total_scanned % 5 == 0:   
-                                table, summary = self.update_live_display(total_scanned, len(wordlist))
-                                display = f"{table}\n{summary}"
-                                live.update(display)
-                        except Exception as e:
-                            total_scanned += 1
+        resumed = resume and self.resume_from_journal(scan_type)
+        if resumed:
+            wordlist = self.skip_completed(wordlist)
         
-        if scan_type in ['full', 'admin']:
-            with ThreadPoolExecutor(max_workers=self.threads) as executor:
-                futures = {executor.submit(self.scan_admin_panels, path): path for path in wordlist}
-                
-                with Live(self.console.print("Scanning Admin Panels..."), refresh_per_second=2) as live:
-                    for future in as_completed(futures):
-                        try:
-                            result = future.result()
-                            total_scanned += 1
-                            
-                            if total_scanned % 5 == 0:
-                                table, summary = self.update_live_display(total_scanned, len(wordlist) * 2)
-                                display = f"{table}\n{summary}"
-                                live.update(display)
-                        except Exception:
-                            total_scanned += 1
+        if self.soft_404:
+            self.calibrate('/')
+        
+        if self.journal_path:
+            self.journal = ScanJournal(self.journal_path)
+            self.journal.open(dict(self.journal_header(scan_type), started=datetime.now().isoformat()), resume=resumed)
+        
+        pipeline = self.build_pipeline(scan_type, check_backups)
+        work = self.build_work_queue(wordlist)
+        try:
+            if self.engine == 'async' and self.check_async_engine():
+                asyncio.run(self.run_async(work, pipeline, total_paths))
+            else:
+                self.run_threaded(work, pipeline, total_paths)
+        finally:
+            if self.journal:
+                self.journal.close()
+            if self.sink_writer:
+                self.sink_writer.close()
+                if self.sink_writer.error:
+                    self.console.print(f"[red]✗ Result sink {self.sink.path} failed: {self.sink_writer.error}[/red]")
+            if metrics_exporter:
+                metrics_exporter.close()
+                if metrics_exporter.error:
+                    self.console.print(f"[red]✗ Metrics snapshot {self.metrics_file} failed: {metrics_exporter.error}[/red]")
+        if self.journal:
+            self.journal.discard()
         
 
+        if self.path_stats:
+            self.record_path_stats()
+        if self.baseline:
+            self.build_diff()
+
         self.console.print("\n")
         self.display_summary()
         
         scan_duration = time.time() - self.scan_start_time
         self.console.print(f"[green]✓ Scan completed in {scan_duration:.2f} seconds[/green]\n")
+        if self.baseline:
+            self.console.print(f"[green]✓ Diff against baseline saved to {self.save_diff()}[/green]\n")
+
+class HostState:
+    """Scheduling state of one target in a multi-target scan"""
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.in_flight = 0
+        self.scanned = 0
+        self.preparing = False
+        self.ready = False
+        self.failed = False
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.failed or (self.ready and self.in_flight == 0 and (self.scanner.work.idle or self.scanner.stopped))
+
+class FairScheduler:
+    """Round-robin dispatch across hosts, capping in-flight requests per host"""
+    def __init__(self, hosts, threads, host_concurrency=None):
+        self.active = deque(hosts)
+        self.threads = threads
+        self.host_concurrency = host_concurrency
+
+    @property
+    def host_limit(self):
+        """Explicit per-host cap, otherwise an equal share of the pool among unfinished hosts"""
+        if self.host_concurrency:
+            return self.host_concurrency
+        return max(1, math.ceil(self.threads / max(len(self.active), 1)))
+
+    def next_task(self):
+        """Next (host, task) to run; task None means the host still needs preparing"""
+        limit = self.host_limit
+        for _ in range(len(self.active)):
+            host = self.active[0]
+            self.active.rotate(-1)
+            if host.in_flight >= limit or host.preparing or host.done or host.scanner.stopped:
+                continue
+            
+            if not host.ready:
+                host.preparing = True
+                host.in_flight += 1
+                return host, None
+            
+            task = host.scanner.work.next()
+            if task is None:
+                if host.done:
+                    self.retire(host)
+                continue
+            host.in_flight += 1
+            return host, task
+        return None, None
+
+    def complete(self, host, task, ok=True):
+        host.in_flight -= 1
+        if task is None:
+            host.preparing = False
+            host.ready = ok
+            host.failed = not ok
+        elif task[0] != 'calibrate':
+            host.scanned += 1
+        if host.done:
+            self.retire(host)
+
+    def retire(self, host):
+        host.finished = time.time()
+        self.active.remove(host)
+
+    @property
+    def finished(self):
+        return not self.active
+
+class MultiTargetScanner:
+    """Scan many base URLs on one shared worker pool with per-host fairness"""
+    UNSUPPORTED = {'journal_path': "a journal", 'sink': "a result sink"}
+
+    def __init__(self, targets, wordlist_path, threads=10, host_concurrency=None, **options):
+        for option, label in self.UNSUPPORTED.items():
+            if options.get(option):
+                raise ValueError(f"multi-target scans do not support {label}")
+        if options.get('engine', 'thread') != 'thread':
+            raise ValueError("multi-target scans run on the thread engine only")
+        self.threads = threads
+        self.host_concurrency = host_concurrency
+        self.console = Console()
+        options.pop('journal_path', None)
+        options.pop('sink', None)
+        host_options = {name: value for name, value in options.items() if not name.startswith('metrics_')}
+        self.scanners = [AdvancedScanner(target, wordlist_path, threads=threads, pool_size=host_concurrency or threads, **host_options)
+                         for target in targets]
+        for scanner in self.scanners:
+            scanner.console = self.console
+        self.hosts = []
+        self.total_paths = 0
+        self.scan_start_time = None
+        self.refresh_per_second = options.get('refresh_per_second', 2)
+        self.live_enabled = options.get('live', True)
+        self.metrics_options = (options.get('metrics_port'), options.get('metrics_file'), options.get('metrics_interval', 10))
+        self.live = None
+        self.scanned = 0
+
+    def prepare_host(self, host):
+        """Reachability check and soft-404 calibration, run on the shared pool"""
+        scanner = host.scanner
+        host.started = time.time()
+        if not scanner.validate_url():
+            return False
+        if scanner.tech_mode != 'off':
+            scanner.fingerprint_target()
+        if scanner.soft_404:
+            scanner.calibrate('/')
+        scanner.build_work_queue(scanner.load_wordlist())
+        return True
+
+    def update_live_display(self, total_scanned):
+        """Per-host progress table"""
+        table = Table(title="🌐 Multi-Target Scan", show_header=True, header_style="bold cyan", border_style="cyan")
+        table.add_column("Host", style="magenta", width=40)
+        table.add_column("Scanned", justify="right", width=12)
+        table.add_column("Found", justify="right", width=6)
+        table.add_column("Admin", justify="right", width=6)
+        table.add_column("Errors", justify="right", width=6)
+        table.add_column("State", style="yellow", width=10)
+        
+        for host in self.hosts:
+            state = "failed" if host.failed else "done" if host.done else "scanning" if host.ready else "waiting"
+            scanner = host.scanner
+            table.add_row(scanner.base_url[:40], f"{host.scanned}/{scanner.expected_paths(self.total_paths)}", str(scanner.count('found')),
+                          str(scanner.count('admin_panels')), str(scanner.count('errors')), state)
+        
+        expected = sum(host.scanner.expected_paths(self.total_paths) for host in self.hosts)
+        summary_text = f"[cyan]Scanned: {total_scanned}/{expected} | Hosts: {len(self.hosts)}[/cyan]"
+        return table, summary_text
+
+    def live_display(self):
+        """Live display redrawn from the per-host counters on rich's refresh thread"""
+        if not self.live_enabled:
+            return nullcontext()
+        self.live = TimedLive(lambda: Group(*self.update_live_display(self.scanned)), self.console, self.refresh_per_second)
+        return self.live
+
+    def run(self, scan_type='full', check_backups=False, resume=False):
+        """Scan every target, interleaving hosts on a single thread pool"""
+        if resume:
+            raise ValueError("multi-target scans cannot be resumed")
+        self.scan_start_time = time.time()
+        if not self.scanners:
+            self.console.print("[red]No targets to scan. Exiting.[/red]")
+            return
+        
+        self.total_paths = self.scanners[0].estimate_wordlist_size()
+        self.hosts = [HostState(scanner) for scanner in self.scanners]
+        scheduler = FairScheduler(self.hosts, self.threads, self.host_concurrency)
+        for scanner in self.scanners:
+            scanner.check_backups = check_backups
+        pipelines = {id(scanner): scanner.build_pipeline(scan_type, check_backups) for scanner in self.scanners}
+        per_host = self.host_concurrency or "fair share"
+        self.console.print(f"\n[bold cyan]Starting scan on {len(self.hosts)} targets "
+                           f"({self.threads} threads, {per_host} per host)[/bold cyan]\n")
+        
+        metrics_exporter = start_metrics(self.console, self.metrics, *self.metrics_options)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            with self.live_display():
+                while True:
+                    while len(in_flight) < self.threads:
+                        host, task = scheduler.next_task()
+                        if host is None:
+                            break
+                        if task is None:
+                            future = executor.submit(self.prepare_host, host)
+                        else:
+                            future = executor.submit(host.scanner.run_task, task, pipelines[id(host.scanner)])
+                        in_flight[future] = (host, task)
+                    
+                    if not in_flight:
+                        break
+                    
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        host, task = in_flight.pop(future)
+                        try:
+                            ok = future.result() is not False
+                        except Exception as e:
+                            ok = task is not None
+                            if task is not None:
+                                host.scanner.record_task_failure(task, e)
+                        scheduler.complete(host, task, ok)
+                        if task is not None and task[0] != 'calibrate':
+                            self.scanned += 1
+        if metrics_exporter:
+            metrics_exporter.close()
+        
+        for host in self.hosts:
+            if host.scanner.path_stats and not host.failed:
+                host.scanner.record_path_stats()
+            if host.scanner.baseline and not host.failed:
+                host.scanner.build_diff()
+        
+        self.console.print("\n")
+        self.display_summary()
+        scan_duration = time.time() - self.scan_start_time
+        ui_cost = f" ({self.live.frames} UI refreshes, {self.live.seconds * 1000:.1f} ms)" if self.live else ""
+        self.console.print(f"[green]✓ Scanned {len(self.hosts)} targets in {scan_duration:.2f} seconds{ui_cost}[/green]\n")
+        for host in self.hosts:
+            scanner = host.scanner
+            if scanner.diff is not None:
+                filename = scanner.save_diff(prefix=f"scan_diff_{safe_host(scanner.base_url)}")
+                self.console.print(f"[green]✓ {scanner.base_url}: {len(scanner.diff['new'])} new, {len(scanner.diff['removed'])} removed, "
+                                   f"{len(scanner.diff['changed'])} changed, saved to {filename}[/green]")
+
+    def metrics(self):
+        """Request phase metrics of every host merged"""
+        return RequestMetrics.combined(scanner.metrics for scanner in self.scanners)
+
+    def display_summary(self):
+        """Per-host results table"""
+        table = Table(title="📊 Multi-Target Summary", show_header=True, header_style="bold cyan", border_style="cyan")
+        table.add_column("Host", style="cyan", width=40)
+        for column in ["Found", "Admin", "Redirects", "Interesting", "Backups", "Errors", "Requests", "Time"]:
+            table.add_column(column, style="magenta", justify="right")
+        
+        for host in self.hosts:
+            scanner = host.scanner
+            elapsed = f"{host.finished - host.started:.1f}s" if host.finished and host.started else "-"
+            table.add_row(scanner.base_url[:40] + (" (unreachable)" if host.failed else ""),
+                          str(scanner.count('found')), str(scanner.count('admin_panels')), str(scanner.count('redirects')),
+                          str(scanner.count('interesting')), str(scanner.count('backup_files')), str(scanner.count('errors')),
+                          str(scanner.total_requests), elapsed)
+        self.console.print(table)
+        phases = phase_table(self.metrics())
+        if phases:
+            self.console.print(phases)
+
+    @property
+    def results(self):
+        """Results grouped per host"""
+        return {scanner.base_url: scanner.results for scanner in self.scanners}
+
+    def save_scan_results(self, format='json'):
+        """Save one report per reachable host, returning the file names joined by commas"""
+        filenames = [host.scanner.save_scan_results(format, prefix=f"scan_results_{safe_host(host.scanner.base_url)}")
+                     for host in self.hosts if not host.failed]
+        return ", ".join(filenames)
+
+def load_targets(file_path):
+    """Read base URLs from a file, one per line, keeping order and dropping duplicates"""
+    targets = []
+    seen = set()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            target = line.strip()
+            if not target or target.startswith('#'):
+                continue
+            if '://' not in target:
+                target = 'http://' + target
+            target = target.rstrip('/')
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+    return targets
+
+def load_rules(file_path):
+    """Read keyword rules written as "category: keyword", one per line, category admin, backup or interesting"""
+    rules = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            category, _, keyword = line.partition(':')
+            category = category.strip().lower()
+            if category not in KeywordMatcher.SCOPES or not keyword.strip():
+                raise ValueError(f"{file_path}:{number}: expected 'admin|backup|interesting: keyword'")
+            rules.append((category, keyword.strip()))
+    return rules
 
 def load_config(file_path="config.json"):
     """Load configuration from file"""
@@ -851,133 +3607,360 @@ def save_config(config, file_path="config.json"):
     with open(file_path, 'w') as file:
         json.dump(config, file, indent=4)
 
-def main():
-    console = Console()
-    console.print(Panel.fit("[bold cyan]🔍 Haider Tools - Advanced Web Scanner[/bold cyan]", border_style="cyan"))
+def safe_host(base_url):
+    """Target host as a string safe to use in file names"""
+    netloc = urlparse(base_url).netloc or base_url
+    return re.sub(r'[^A-Za-z0-9._-]', '_', netloc)
+
+def default_journal_path(base_url):
+    """Journal file name derived from the target host"""
+    return f"journal_{safe_host(base_url)}.jsonl"
+
+def build_parser():
+    """Command line covering every scanner option; options left out are prompted for unless --headless"""
+    parser = argparse.ArgumentParser(description="Haider Tools - Advanced Web Scanner")
+    parser.add_argument('--config', metavar='FILE', help="JSON file of option defaults keyed by option name, e.g. {\"threads\": 50}")
+    parser.add_argument('--headless', action='store_true',
+                        help="never prompt, no live display, log to stderr and print a JSON summary to stdout")
+
+    target = parser.add_argument_group('target')
+    target.add_argument('-u', '--url', help="base URL to scan")
+    target.add_argument('--targets', help="file with one base URL per line, scanned together on one worker pool "
+                                          "(thread engine, no --resume, --journal or --sink)")
+    target.add_argument('-w', '--wordlist', help="wordlist file")
+    target.add_argument('--compile-wordlist', metavar='WORDLIST', help="compile a wordlist into the cache and exit")
+
+    scan = parser.add_argument_group('scan')
+    scan.add_argument('--scan-type', choices=['full', 'directories', 'admin'], help="classifiers to run (default: full)")
+    scan.add_argument('--check-backups', action=argparse.BooleanOptionalAction, help="probe backup variants of every hit")
+    scan.add_argument('--max-depth', type=int, help="recursion depth into found directories, 0 to disable")
+    scan.add_argument('--stop-after', type=int, default=0, metavar='N', help="stop once N admin panels are confirmed")
+    scan.add_argument('--order', choices=['file', 'prior'], help="wordlist order (default: prior with --stop-after or learned path statistics, else file)")
+    scan.add_argument('--tech', choices=['off', 'promote', 'prune'], default='prune',
+                      help="reorder (promote) or also drop (prune) wordlist entries by the detected technology")
+    scan.add_argument('--rules', action='append', default=[], help="keyword rule file, 'category: keyword' per line (repeatable)")
+    scan.add_argument('--ext', action='append', default=[], metavar='EXT[:WEIGHT]', help="also try each entry with this extension, e.g. .php:0.8")
+    scan.add_argument('--case', action='append', default=[], metavar='CASE[:WEIGHT]', help="case variant: lower, upper, capitalize or title")
+    scan.add_argument('--template', action='append', default=[], metavar='TEMPLATE[:WEIGHT]', help="path template containing {word}, e.g. {word}_old:0.3")
+    scan.add_argument('--baseline', action='append', default=[], metavar='RESULTS_JSON',
+                      help="previous JSON results to revalidate and diff against (repeatable)")
+    scan.add_argument('--sample', type=float, default=1.0, metavar='FRACTION', help="fraction of the wordlist to scan, e.g. 0.25 (default: 1)")
+    scan.add_argument('--sample-slice', type=int, metavar='N', help="which slice to scan with --sample (default: rotates weekly)")
+    scan.add_argument('--stats', nargs='?', const=default_stats_path(), metavar='DB',
+                      help=f"learn path statistics across scans in DB (default when given without DB: {default_stats_path()})")
+    scan.add_argument('--no-stats', action='store_true', help="neither use nor update learned path statistics, overriding --stats")
+    scan.add_argument('--resume', action='store_true', help="skip paths already completed in the scan journal")
+    scan.add_argument('--journal', help="journal file (default: journal_<host>.jsonl)")
+
+    http = parser.add_argument_group('requests')
+    http.add_argument('-t', '--threads', type=int, help="threads / concurrent requests (default: 10)")
+    http.add_argument('--engine', choices=['thread', 'async'], help="request engine (default: thread)")
+    http.add_argument('--probe-mode', choices=['get', 'head', 'stream'], help="how much of each response to fetch (default: get)")
+    http.add_argument('--user-agent', help="User-Agent header (default: Mozilla/5.0)")
+    http.add_argument('--timeout', type=float, help="request timeout in seconds (default: 5)")
+    http.add_argument('--max-rps', type=float, help="max requests/sec across all threads, 0 for unlimited")
+    http.add_argument('--rate-limit', type=float, default=0, help="legacy per-thread delay in seconds, converted to --max-rps")
+    http.add_argument('--throttle-retries', type=int, default=3, help="retries of a 429/503 behind the rate limiter")
+    http.add_argument('--proxy', help="proxy URL, http://, https://, socks4:// or socks5://, credentials included")
+    http.add_argument('--verify-ssl', action=argparse.BooleanOptionalAction, help="verify TLS certificates (default: yes)")
+    http.add_argument('--follow-redirects', action=argparse.BooleanOptionalAction, default=True, help="follow redirects (default: yes)")
+    http.add_argument('--host-concurrency', type=int, help="max in-flight requests per host in multi-target mode")
+    http.add_argument('--pool-size', type=int, help="connections kept per host (default: threads)")
+    http.add_argument('--pool-block', action='store_true', help="wait for a free pooled connection instead of opening extra ones")
+    http.add_argument('--keep-alive', action=argparse.BooleanOptionalAction, default=True, help="reuse connections (default: yes)")
+    http.add_argument('--retries', type=int, default=0, help="connection-level retries per request")
+    http.add_argument('--retry-backoff', type=float, default=0.0, help="backoff factor between connection retries")
+    http.add_argument('--submit-window', type=int, default=4, help="in-flight futures per thread on the thread engine")
+    http.add_argument('--drain-limit', type=int, default=8192, help="bytes drained before closing a body the stream probe mode skips")
+    http.add_argument('--max-body-bytes', type=int, default=1048576, help="bytes of each body read for classification, 0 for all")
+
+    detection = parser.add_argument_group('detection')
+    detection.add_argument('--soft-404', action=argparse.BooleanOptionalAction, default=True, help="filter catch-all responses (default: yes)")
+    detection.add_argument('--calibration-probes', type=int, default=3, help="random paths requested per directory for soft-404 calibration")
+    detection.add_argument('--dedup', choices=['exact', 'bloom'], default='exact', help="wordlist duplicate filter")
+    detection.add_argument('--bloom-error-rate', type=float, default=0.001, help="false positive rate of --dedup bloom")
+    detection.add_argument('--wordlist-cache', action=argparse.BooleanOptionalAction, default=True,
+                           help="use the compiled wordlist cache (default: yes)")
+    detection.add_argument('--wordlist-cache-dir', help="compiled wordlist directory (default: ~/.cache/haider)")
+
+    output = parser.add_argument_group('output')
+    output.add_argument('--save', action=argparse.BooleanOptionalAction, help="save results when the scan completes (default: yes)")
+    output.add_argument('--format', choices=['json', 'csv', 'html', 'txt'], help="results file format (default: json)")
+    output.add_argument('--sink', help="stream results to a .jsonl, .csv or .db/.sqlite file instead of memory")
+    output.add_argument('--auto-browse', action=argparse.BooleanOptionalAction, help="open every 200 response in the browser")
+    output.add_argument('--browse-delay', type=float, help="seconds to wait before opening each URL (default: 2)")
+    output.add_argument('--live-window', type=int, default=100, help="recent hits kept for the live display")
+    output.add_argument('--refresh', type=float, default=2, help="live display refreshes per second")
+    output.add_argument('--metrics-port', type=int, metavar='PORT', help="serve request phase histograms as Prometheus text on 127.0.0.1:PORT/metrics")
+    output.add_argument('--metrics-json', metavar='FILE', help="write request phase histograms to FILE as JSON snapshots")
+    output.add_argument('--metrics-interval', type=float, default=10, help="seconds between --metrics-json snapshots")
+    return parser
+
+def load_options_file(parser, file_path):
+    """Option defaults from a JSON config file, keyed by option name with - or _"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        options = json.load(file)
+    if not isinstance(options, dict):
+        raise ValueError("expected a JSON object")
+    known = {action.dest for action in parser._actions}
+    defaults = {}
+    for name, value in options.items():
+        dest = name.replace('-', '_')
+        if dest not in known or dest in ['config', 'help']:
+            raise ValueError(f"unknown option {name!r}")
+        defaults[dest] = value
+    return defaults
+
+def prompt_proxy(console):
+    """Interactive proxy configuration, returning the proxy URL or None"""
+    console.print("[yellow]Proxy Configuration Options:[/yellow]")
+    console.print("  1. HTTP Proxy (http://ip:port)")
+    console.print("  2. HTTPS Proxy (https://ip:port)")
+    console.print("  3. SOCKS5 Proxy (socks5://ip:port)")
+    console.print("  4. SOCKS4 Proxy (socks4://ip:port)")
+    
+    proxy = None
+    proxy_type = console.input("[cyan]Select proxy type (1-4) or paste custom proxy URL[/cyan]: ").strip()
     
-    config = load_config()
+    if proxy_type in ['1', '2', '3', '4']:
+        proxy_url = console.input("[cyan]Enter proxy server address (ip:port)[/cyan]: ").strip()
+        if proxy_url:
+            if proxy_type == '1':
+                proxy = f"http://{proxy_url}"
+                console.print(f"[green]✓ HTTP Proxy configured: {proxy}[/green]")
+            elif proxy_type == '2':
+                proxy = f"https://{proxy_url}"
+                console.print(f"[green]✓ HTTPS Proxy configured: {proxy}[/green]")
+            elif proxy_type == '3':
+                proxy = f"socks5://{proxy_url}"
+                console.print(f"[green]✓ SOCKS5 Proxy configured: {proxy}[/green]")
+            elif proxy_type == '4':
+                proxy = f"socks4://{proxy_url}"
+                console.print(f"[green]✓ SOCKS4 Proxy configured: {proxy}[/green]")
+    else:
+        proxy = proxy_type if proxy_type.startswith(('http://', 'https://', 'socks4://', 'socks5://')) else None
+        if proxy:
+            console.print(f"[green]✓ Custom proxy configured: {proxy}[/green]")
+        else:
+            console.print("[yellow]! Invalid proxy format, proceeding without proxy[/yellow]")
+            return None
     
 
-    auto_detected_wordlist = None
-    if os.path.exists("wordlist.txt"):
-        auto_detected_wordlist = "wordlist.txt"
-        console.print("[green]✓ Auto-detected wordlist.txt in current directory[/green]")
+    if proxy:
+        auth_needed = console.input("[cyan]Does proxy require authentication? (y/n)[/cyan] (default n): ").lower() == 'y'
+        if auth_needed:
+            username = console.input("[cyan]Enter proxy username[/cyan]: ").strip()
+            password = console.input("[cyan]Enter proxy password[/cyan]: ").strip()
+            if username and password:
+                if "://" in proxy:
+                    scheme, rest = proxy.split("://", 1)
+                    proxy = f"{scheme}://{username}:{password}@{rest}"
+                    console.print("[green]✓ Proxy authentication credentials added[/green]")
+    return proxy
+
+def scan_summary(scanner, started):
+    """Machine-readable outcome of one target's scan for --headless"""
+    summary = {'target': scanner.base_url, 'scanned': scanner.work is not None, 'requests': scanner.total_requests,
+               'duration': round(time.time() - started, 3)}
+    for category in ['found', 'admin_panels', 'redirects', 'interesting', 'backup_files', 'errors']:
+        summary[category] = scanner.count(category)
+    if scanner.diff is not None:
+        summary.update({change: len(paths) for change, paths in scanner.diff.items()})
+    return summary
+
+def main():
+    parser = build_parser()
+    args, _ = parser.parse_known_args()
+    if args.config:
+        try:
+            parser.set_defaults(**load_options_file(parser, args.config))
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load --config {args.config}: {e}")
+    args = parser.parse_args()
+    
+    interactive = not args.headless
+    console = Console(stderr=True) if args.headless else Console()
+    if interactive:
+        from rich.panel import Panel
+        from rich.traceback import install as install_rich_traceback
+        install_rich_traceback()
+        console.print(Panel.fit("[bold cyan]🔍 Haider Tools - Advanced Web Scanner[/bold cyan]", border_style="cyan"))
     
+    if args.compile_wordlist:
+        start = time.time()
+        try:
+            compiled = open_compiled_wordlist(args.compile_wordlist)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]✗ Cannot compile wordlist: {e}[/red]")
+            return 1
+        console.print(f"[green]✓ {len(compiled)} unique paths ({compiled.duplicates} duplicates dropped) "
+                      f"compiled to {compiled.path} in {time.time() - start:.2f}s[/green]")
+        return 0
+    
+    config = load_config() if interactive else {}
+    
+    def ask(value, prompt, default, convert=str):
+        """Command line value, else the answer to prompt, else the saved or built-in default"""
+        if value is not None:
+            return value
+        if not interactive:
+            return default
+        answer = console.input(prompt).strip()
+        return convert(answer) if answer else default
+    
+    rules = []
+    for rules_path in args.rules:
+        try:
+            rules += load_rules(rules_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]✗ Cannot load rules: {e}[/red]")
+            return 1
+    if rules:
+        console.print(f"[green]✓ Loaded {len(rules)} keyword rules[/green]")
+    
+    try:
+        mutator = WordlistMutator(extensions=[parse_weighted(spec, 0.5) for spec in args.ext],
+                                  cases=[parse_weighted(spec, 0.2) for spec in args.case],
+                                  templates=[parse_weighted(spec, 0.3) for spec in args.template])
+    except ValueError as e:
+        console.print(f"[red]✗ Invalid wordlist mutation: {e}[/red]")
+        return 1
+
+    if not 0 < args.sample <= 1:
+        console.print("[red]✗ --sample must be a fraction between 0 and 1[/red]")
+        return 1
+    for baseline_path in args.baseline:
+        try:
+            ScanBaseline('', [baseline_path])
+        except (OSError, ValueError, KeyError) as e:
+            console.print(f"[red]✗ Cannot load baseline {baseline_path}: {e}[/red]")
+            return 1
 
-    base_url = console.input("[cyan]Enter base URL[/cyan] (or press Enter to use saved): ").strip() or config.get("base_url", "")
+    targets = []
+    if args.targets:
+        try:
+            targets = load_targets(args.targets)
+        except OSError as e:
+            console.print(f"[red]✗ Cannot read targets file: {e}[/red]")
+            return 1
+        if not targets:
+            console.print("[red]✗ Targets file contains no URLs![/red]")
+            return 1
+        unsupported = [option for option, given in [('--engine async', args.engine == 'async'), ('--resume', args.resume),
+                                                    ('--journal', args.journal), ('--sink', args.sink)] if given]
+        if unsupported:
+            console.print(f"[red]✗ {', '.join(unsupported)} cannot be combined with --targets[/red]")
+            return 1
+        console.print(f"[green]✓ Loaded {len(targets)} targets from {args.targets}[/green]")
+        base_url = targets[0]
+    else:
+        base_url = ask(args.url, "[cyan]Enter base URL[/cyan] (or press Enter to use saved): ", config.get("base_url", ""))
     if not base_url:
         console.print("[red]✗ Base URL is required![/red]")
-        return
+        return 1
     
 
-    if auto_detected_wordlist:
-        use_auto = console.input("[cyan]Use auto-detected wordlist.txt? (y/n)[/cyan] (default y): ").lower() != 'n'
-        wordlist_path = auto_detected_wordlist if use_auto else (console.input("[cyan]Enter wordlist path[/cyan]: ").strip() or config.get("wordlist_path", ""))
-    else:
-        wordlist_path = console.input("[cyan]Enter wordlist path[/cyan] (or press Enter to use saved): ").strip() or config.get("wordlist_path", "")
+    wordlist_path = args.wordlist
+    if wordlist_path is None and interactive:
+        if os.path.exists("wordlist.txt"):
+            console.print("[green]✓ Auto-detected wordlist.txt in current directory[/green]")
+            use_auto = console.input("[cyan]Use auto-detected wordlist.txt? (y/n)[/cyan] (default y): ").lower() != 'n'
+            wordlist_path = "wordlist.txt" if use_auto else (console.input("[cyan]Enter wordlist path[/cyan]: ").strip() or config.get("wordlist_path", ""))
+        else:
+            wordlist_path = console.input("[cyan]Enter wordlist path[/cyan] (or press Enter to use saved): ").strip() or config.get("wordlist_path", "")
     
     if not wordlist_path:
         console.print("[red]✗ Wordlist path is required![/red]")
-        return
+        return 1
     
-    threads = int(console.input("[cyan]Threads[/cyan] (default 10): ").strip() or config.get("threads", 10))
-    user_agent = console.input("[cyan]User-Agent[/cyan] (press Enter for default): ").strip() or config.get("user_agent", "Mozilla/5.0")
-    timeout = int(console.input("[cyan]Timeout (seconds)[/cyan] (default 5): ").strip() or config.get("timeout", 5))
-    rate_limit = float(console.input("[cyan]Rate limit (seconds between requests, 0 for none)[/cyan] (default 0): ").strip() or "0")
+    yes_no = lambda answer: answer.lower() == 'y'
+    if targets:
+        engine = 'thread'
+    else:
+        engine = ask(args.engine, "[cyan]Engine? (thread/async)[/cyan] (default thread): ", config.get("engine", "thread"), str.lower)
+    probe_mode = ask(args.probe_mode, "[cyan]Probe mode? (get/head/stream)[/cyan] (default get): ", config.get("probe_mode", "get"), str.lower)
+    threads = ask(args.threads, "[cyan]Threads / concurrent requests[/cyan] (default 10): ", config.get("threads", 10), int)
+    user_agent = ask(args.user_agent, "[cyan]User-Agent[/cyan] (press Enter for default): ", config.get("user_agent", "Mozilla/5.0"))
+    timeout = ask(args.timeout, "[cyan]Timeout (seconds)[/cyan] (default 5): ", config.get("timeout", 5), int)
+    max_rps = ask(args.max_rps, "[cyan]Max requests/sec across all threads, 0 for unlimited[/cyan] (default 0): ", config.get("max_rps", 0), float)
     
-    auto_browse = console.input("[cyan]Auto-open URLs? (y/n)[/cyan] (default n): ").lower() == 'y'
-    browse_delay = int(console.input("[cyan]Browse delay (seconds)[/cyan] (default 2): ").strip() or 2) if auto_browse else 0
-    verify_ssl = console.input("[cyan]Verify SSL? (y/n)[/cyan] (default y): ").lower() != 'n'
+    auto_browse = ask(args.auto_browse, "[cyan]Auto-open URLs? (y/n)[/cyan] (default n): ", False, yes_no)
+    browse_delay = ask(args.browse_delay, "[cyan]Browse delay (seconds)[/cyan] (default 2): ", 2, int) if auto_browse else 0
+    verify_ssl = ask(args.verify_ssl, "[cyan]Verify SSL? (y/n)[/cyan] (default y): ", True, lambda answer: answer.lower() != 'n')
     
 
-    use_proxy = console.input("[cyan]Use proxy? (y/n)[/cyan] (default n): ").lower() == 'y'
-    proxy = None
-    proxy_type = None
-    
-    if use_proxy:
-        console.print("[yellow]Proxy Configuration Options:[/yellow]")
-        console.print("  1. HTTP Proxy (http://ip:port)")
-        console.print("  2. HTTPS Proxy (https://ip:port)")
-        console.print("  3. SOCKS5 Proxy (socks5://ip:port)")
-        console.print("  4. SOCKS4 Proxy (socks4://ip:port)")
-        
-        proxy_type = console.input("[cyan]Select proxy type (1-4) or paste custom proxy URL[/cyan]: ").strip()
-        
-        if proxy_type in ['1', '2', '3', '4']:
-            proxy_url = console.input("[cyan]Enter proxy server address (ip:port)[/cyan]: ").strip()
-            if proxy_url:
-                if proxy_type == '1':
-                    proxy = f"http://{proxy_url}"
-                    console.print(f"[green]✓ HTTP Proxy configured: {proxy}[/green]")
-                elif proxy_type == '2':
-                    proxy = f"https://{proxy_url}"
-                    console.print(f"[green]✓ HTTPS Proxy configured: {proxy}[/green]")
-                elif proxy_type == '3':
-                    proxy = f"socks5://{proxy_url}"
-                    console.print(f"[green]✓ SOCKS5 Proxy configured: {proxy}[/green]")
-                elif proxy_type == '4':
-                    proxy = f"socks4://{proxy_url}"
-                    console.print(f"[green]✓ SOCKS4 Proxy configured: {proxy}[/green]")
+    proxy = args.proxy
+    if proxy is None and interactive:
+        if console.input("[cyan]Use proxy? (y/n)[/cyan] (default n): ").lower() == 'y':
+            proxy = prompt_proxy(console)
         else:
-            proxy = proxy_type if proxy_type.startswith(('http://', 'https://', 'socks4://', 'socks5://')) else None
-            if proxy:
-                console.print(f"[green]✓ Custom proxy configured: {proxy}[/green]")
-            else:
-                console.print("[yellow]! Invalid proxy format, proceeding without proxy[/yellow]")
-                proxy = None
-        
-
-        if proxy:
-            auth_needed = console.input("[cyan]Does proxy require authentication? (y/n)[/cyan] (default n): ").lower() == 'y'
-            if auth_needed:
-                username = console.input("[cyan]Enter proxy username[/cyan]: ").strip()
-                password = console.input("[cyan]Enter proxy password[/cyan]: ").strip()
-                if username and password:
-                    if "://" in proxy:
-                        scheme, rest = proxy.split("://", 1)
-                        proxy = f"{scheme}://{username}:{password}@{rest}"
-                        console.print("[green]✓ Proxy authentication credentials added[/green]")
-    else:
-        console.print("[cyan]Proceeding without proxy[/cyan]")
+            console.print("[cyan]Proceeding without proxy[/cyan]")
     
-    scan_type = console.input("[cyan]Scan type? (full/directories/admin)[/cyan] (default full): ").lower().strip() or "full"
-    check_backups = console.input("[cyan]Check for backup files? (y/n)[/cyan] (default n): ").lower() == 'y'
+    scan_type = ask(args.scan_type, "[cyan]Scan type? (full/directories/admin)[/cyan] (default full): ", "full", str.lower)
+    max_depth = ask(args.max_depth, "[cyan]Recursion depth into found directories, 0 to disable[/cyan] (default 0): ", config.get("max_depth", 0), int)
+    check_backups = ask(args.check_backups, "[cyan]Check for backup files? (y/n)[/cyan] (default n): ", False, yes_no)
     
 
-    save_on_exit = console.input("[cyan]Auto-save results when scan completes? (y/n)[/cyan] (default y): ").lower() != 'n'
-    export_format = console.input("[cyan]Export format? (json/csv/html/txt)[/cyan] (default json): ").lower().strip() or "json" if save_on_exit else None
+    save_on_exit = ask(args.save, "[cyan]Auto-save results when scan completes? (y/n)[/cyan] (default y): ", True, lambda answer: answer.lower() != 'n')
+    export_format = ask(args.format, "[cyan]Export format? (json/csv/html/txt)[/cyan] (default json): ", "json", str.lower) if save_on_exit else None
     
-    config.update({
-        "base_url": base_url,
-        "wordlist_path": wordlist_path,
-        "threads": threads,
-        "user_agent": user_agent,
-        "timeout": timeout,
-        "rate_limit": rate_limit,
-        "auto_browse": auto_browse,
-        "browse_delay": browse_delay,
-        "verify_ssl": verify_ssl
-    })
-    save_config(config)
+    if interactive:
+        config.update({
+            "base_url": base_url,
+            "wordlist_path": wordlist_path,
+            "threads": threads,
+            "engine": engine,
+            "probe_mode": probe_mode,
+            "user_agent": user_agent,
+            "timeout": timeout,
+            "max_rps": max_rps,
+            "max_depth": max_depth,
+            "auto_browse": auto_browse,
+            "browse_delay": browse_delay,
+            "verify_ssl": verify_ssl
+        })
+        save_config(config)
     
+    # Headless runs leave the working directory alone and log where a scheduler collects it
     logging.basicConfig(
-        filename="haider_tools.log",
+        **({'stream': sys.stderr} if args.headless else {'filename': "haider_tools.log"}),
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
     
-    scanner = AdvancedScanner(base_url, wordlist_path, threads, user_agent, timeout, 
-                             auto_browse, browse_delay, verify_ssl, rate_limit=rate_limit, proxy=proxy)
+    options = dict(user_agent=user_agent, timeout=timeout, auto_browse=auto_browse, browse_delay=browse_delay,
+                   verify_ssl=verify_ssl, follow_redirects=args.follow_redirects, rate_limit=args.rate_limit,
+                   max_rps=max_rps, throttle_retries=args.throttle_retries, proxy=proxy, engine=engine,
+                   pool_block=args.pool_block, keep_alive=args.keep_alive, retries=args.retries,
+                   retry_backoff=args.retry_backoff, dedup=args.dedup, bloom_error_rate=args.bloom_error_rate,
+                   submit_window=args.submit_window, soft_404=args.soft_404, calibration_probes=args.calibration_probes,
+                   probe_mode=probe_mode, drain_limit=args.drain_limit, max_body_bytes=args.max_body_bytes,
+                   live_window=args.live_window, max_depth=max_depth, rules=rules, wordlist_cache=args.wordlist_cache,
+                   wordlist_cache_dir=args.wordlist_cache_dir, mutator=mutator if mutator else None, tech_mode=args.tech,
+                   stop_after=args.stop_after, order=args.order, stats_path=None if args.no_stats else args.stats,
+                   baseline=args.baseline, sample=args.sample, sample_slice=args.sample_slice,
+                   refresh_per_second=args.refresh, live=interactive, interactive=interactive,
+                   metrics_port=args.metrics_port, metrics_file=args.metrics_json, metrics_interval=args.metrics_interval)
+    if targets:
+        scanner = MultiTargetScanner(targets, wordlist_path, threads, host_concurrency=args.host_concurrency, **options)
+    else:
+        scanner = AdvancedScanner(base_url, wordlist_path, threads, journal_path=args.journal or default_journal_path(base_url),
+                                  sink=args.sink, pool_size=args.pool_size, **options)
+    scanner.console = console
+    for host_scanner in getattr(scanner, 'scanners', []):
+        host_scanner.console = console
     
+    started = time.time()
+    filename = None
     try:
-        scanner.run(scan_type, check_backups)
+        scanner.run(scan_type, check_backups, resume=args.resume)
         
 
         if save_on_exit and export_format:
             console.print("\n[cyan]Saving scan results...[/cyan]")
             filename = scanner.save_scan_results(export_format)
             console.print(f"[green]✓ Results saved to {filename}[/green]")
-        else:
+        elif interactive:
 
             want_save = console.input("\n[cyan]Save results to file? (y/n)[/cyan]: ").lower() == 'y'
             if want_save:
@@ -987,6 +3970,10 @@ def main():
     
     except KeyboardInterrupt:
         console.print("\n[yellow]! Scan interrupted by user[/yellow]")
+        if not targets:
+            console.print(f"[cyan]Progress is journaled in {scanner.journal_path}, re-run with --resume to continue[/cyan]")
+        if not interactive:
+            return 130
         
 
         want_save = console.input("[cyan]Save partial results before exit? (y/n)[/cyan]: ").lower() == 'y'
@@ -994,6 +3981,14 @@ def main():
             formats = console.input("[cyan]Export format? (json/csv/html/txt)[/cyan] (default json): ").lower().strip() or "json"
             filename = scanner.save_scan_results(formats)
             console.print(f"[green]✓ Partial results saved to {filename}[/green]")
+    
+    if args.headless:
+        hosts = [host.scanner for host in scanner.hosts] if targets else [scanner]
+        summaries = [scan_summary(host, started) for host in hosts]
+        print(json.dumps({'results_file': filename, 'targets': summaries}))
+        if not all(summary['scanned'] for summary in summaries):
+            return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import random
+import string
+
+from haider import KeywordMatcher, KeywordSearch
+
+
+def test_overlapping_body_keywords_are_all_reported():
+    matcher = KeywordMatcher([('admin', 'cpanel'), ('admin', 'panel'), ('admin', 'pan'), ('admin', 'login')])
+    matches = matcher.match('/x', '<h1>cPanel</h1>')
+    assert matches == {'admin': ['cpanel', 'panel', 'pan']}
+
+
+def test_overlapping_path_keywords_and_suffixes():
+    matcher = KeywordMatcher([('interesting', 'api_key'), ('interesting', 'key'), ('interesting', 'keys'),
+                              ('backup', '.bak'), ('backup', 'bak')])
+    matches = matcher.match('/API_KEYS.bak')
+    assert matches == {'interesting': ['api_key', 'key', 'keys'], 'backup': ['.bak', 'bak']}
+    assert 'backup' not in matcher.match('/site.bak.html')
+
+
+def test_automaton_matches_substring_loop():
+    rng = random.Random(7)
+    words = set()
+    while len(words) <= KeywordSearch.LOOP_LIMIT:
+        words.add(''.join(rng.choice('abc') for _ in range(rng.randint(1, 6))))
+    words = sorted(words)
+    search = KeywordSearch(words)
+    assert search.automaton is not None
+    for _ in range(50):
+        text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 40)))
+        assert search.find(text) == [word for word in dict.fromkeys(words) if word in text]
+
+
+def test_large_rule_set_reports_overlaps():
+    rules = [('admin', ''.join(random.Random(i).choice(string.ascii_lowercase) for _ in range(8))) for i in range(500)]
+    matcher = KeywordMatcher(rules + [('admin', 'cpanel'), ('admin', 'panel')])
+    assert matcher.match('/', 'welcome to cpanel')['admin'] == ['cpanel', 'panel']
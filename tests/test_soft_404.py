@@ -0,0 +1,56 @@
+import uuid
+
+from haider import ResponseFingerprint, SoftNotFoundBaseline
+
+
+def catch_all(path, request_id=1):
+    return f"<html><h1>Welcome</h1><p>{path}</p><!-- request {request_id} --></html>"
+
+
+def fingerprint(path, body, status=200):
+    """Fingerprint the way the scanner does, with the requested path removed from the body"""
+    return ResponseFingerprint(status, body.replace(path.strip('/'), ''))
+
+
+def calibrated(probes=3):
+    baseline = SoftNotFoundBaseline('/')
+    for i in range(probes):
+        path = '/' + uuid.uuid4().hex[:12]
+        baseline.add(fingerprint(path, catch_all(path, 1000 + i)))
+    return baseline
+
+
+def test_small_real_pages_are_kept_next_to_a_catch_all():
+    baseline = calibrated()
+    pages = {
+        '/dashboard': "<html><h1>Dashboard</h1></html>",
+        '/admin/': "<html><title>Admin Login</title><form>password</form></html>",
+        '/backup.zip': ("PK\x03\x04" + "\x00" * 512),
+        '/config.php': "<?php // config ?>",
+        '/api/keys': '{"secret": "sk_live_0123456789"}',
+        '/x': 'x' * 1000,
+    }
+    for path, body in pages.items():
+        assert not baseline.matches(fingerprint(path, body)), path
+
+
+def test_catch_all_duplicates_are_filtered():
+    baseline = calibrated()
+    assert len(baseline.by_status[200]) == 1
+    for path in ['/dashboard', '/backup.zip', '/deep/nested/path.php', '/x']:
+        assert baseline.matches(fingerprint(path, catch_all(path, 987654))), path
+
+
+def test_small_bodies_need_matching_status_and_close_lengths():
+    body = catch_all('/')
+    assert not ResponseFingerprint(200, body).similar(ResponseFingerprint(403, body))
+    assert not ResponseFingerprint(200, body + ' ' * 40).similar(ResponseFingerprint(200, body))
+
+
+def test_large_catch_all_pages_use_simhash():
+    words = ' '.join(f"word{i}" for i in range(600))
+    known = ResponseFingerprint(200, f"<html>{words} request 1</html>")
+    assert known.digest is None
+    assert ResponseFingerprint(200, f"<html>{words} request 2</html>").similar(known)
+    other = ' '.join(f"term{i}" for i in range(600))
+    assert not ResponseFingerprint(200, f"<html>{other}</html>").similar(known)